@@ -41,7 +41,7 @@ from utils.parse_ascii_tree_block.parse_ascii_tree_block import parse_ascii_tree
 from utils.map_headings_to_files.map_headings_to_files import map_headings_to_files
 from utils.try_rescue_unassigned.try_rescue_unassigned import try_rescue_unassigned
 from utils.extract_project_readme.extract_project_readme import extract_project_readme
-from utils.reconcile_and_write.reconcile_and_write import reconcile_and_write
+from utils.reconcile_and_write.reconcile_and_write import reconcile_and_write, content_fingerprint, FILE_MODIFICATIONS_CACHE_KEY
 from utils.verify_output.verify_output import verify_output
 from utils.write_extension_report.write_extension_report import write_extension_report
 from utils.resolve_conflict_interactive.resolve_conflict_interactive import resolve_conflict_interactive, resolve_conflict_batch
@@ -349,10 +349,10 @@ def main():
                 )
                 
                 # Load file modification cache
-                file_cache = cache_manager.load("file_modifications") or {}
+                file_cache = cache_manager.load(FILE_MODIFICATIONS_CACHE_KEY) or {}
                 
                 if args.verbose:
-                    cache_info = cache_manager.get_info("file_modifications")
+                    cache_info = cache_manager.get_info(FILE_MODIFICATIONS_CACHE_KEY)
                     logging.info(f"ℹ️ Cache loaded: {cache_info.get('entry_count', 0)} entries, {cache_info.get('size_bytes', 0)} bytes")
                     
             except Exception as e:
@@ -456,11 +456,11 @@ def main():
                         cache_data[file_path] = {
                             'modified': full_path.stat().st_mtime,
                             'size': full_path.stat().st_size,
-                            'hash': generate_cache_key(full_path.read_text(encoding='utf-8'))
+                            'hash': content_fingerprint(full_path.read_text(encoding='utf-8'))
                         }
                 
                 # Save updated cache
-                cache_manager.save("file_modifications", cache_data)
+                cache_manager.save(FILE_MODIFICATIONS_CACHE_KEY, cache_data)
                 
                 # Log cache statistics
                 cache_stats = cache_manager.get_stats()
@@ -493,11 +493,11 @@ def main():
         # Cache debugging
         if args.cache_debug and cache_manager:
             try:
-                cache_info = cache_manager.debug("file_modifications")
+                cache_info = cache_manager.debug(FILE_MODIFICATIONS_CACHE_KEY)
                 logging.info(f"🔍 Cache debug info: {cache_info}")
                 
                 # Also debug the main cache file
-                cache_file_info = get_cache_info(out_root / ".generator_cache" / "file_modifications.json")
+                cache_file_info = get_cache_info(out_root / ".generator_cache" / f"{FILE_MODIFICATIONS_CACHE_KEY}.json")
                 logging.info(f"🔍 Cache file info: {cache_file_info}")
             except Exception as e:
                 logging.warning(f"⚠️ Cache debugging failed: {e}")
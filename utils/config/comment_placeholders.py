@@ -1,6 +1,9 @@
+import sys
 from typing import Dict
 
-# Default placeholders by extension with more comprehensive coverage
+# Default placeholders by extension with more comprehensive coverage.
+# Keys are interned below so lookup keys interned at the call sites
+# compare pointer-equal inside the dict probe
 EXT_COMMENT_PLACEHOLDER: Dict[str, str] = {
     # Programming languages
     ".py": "# TODO: implement\n",
@@ -58,6 +61,10 @@ EXT_COMMENT_PLACEHOLDER: Dict[str, str] = {
     "default": "# TODO: implement\n",
 }
 
+EXT_COMMENT_PLACEHOLDER = {
+    sys.intern(key): value for key, value in EXT_COMMENT_PLACEHOLDER.items()
+}
+
 def get_default_placeholder(ext: str) -> str:
     """
     Get appropriate placeholder content for file extension.
@@ -1,6 +1,7 @@
 from pathlib import Path
 import json
 import logging
+import sys
 from typing import Dict, Optional, Union, List
 from .comment_placeholders import EXT_COMMENT_PLACEHOLDER
 from .special_files import SPECIAL_FILES, is_special_file
@@ -131,7 +132,11 @@ def merge_placeholders_from_file(placeholders_path: Optional[str] = None) -> boo
         merged_count = 0
         for key, value in data.items():
             if isinstance(key, str) and isinstance(value, str):
-                EXT_COMMENT_PLACEHOLDER[key] = value
+                # Built-in placeholders all end with a newline; normalize
+                # merged ones the same way so written files stay uniform
+                # and line counting can rely on the invariant. Keys are
+                # interned to match the built-in table
+                EXT_COMMENT_PLACEHOLDER[sys.intern(key)] = value if value.endswith("\n") else value + "\n"
                 merged_count += 1
             else:
                 logging.warning(f"⚠️ Skipping invalid placeholder entry: {key}")
@@ -107,7 +107,7 @@ DEFAULT_IGNORE_PATTERNS = [
 ]
 
 # NEW: Explicit directory names to always ignore (case-insensitive)
-EXPLICIT_IGNORE_DIRS = {
+EXPLICIT_IGNORE_DIRS = frozenset({
     # Python
     "__pycache__",
     ".pytest_cache",
@@ -156,7 +156,11 @@ EXPLICIT_IGNORE_DIRS = {
     
     # Documentation
     "_build",  # Sphinx
-}
+})
+
+# Pre-lowered at import so hot dir-prune paths can do a single set lookup
+# instead of lowering the whole set per call
+EXPLICIT_IGNORE_DIRS_LOWER = frozenset(d.lower() for d in EXPLICIT_IGNORE_DIRS)
 
 # Language extensions mapping for better code highlighting
 LANGUAGE_EXTENSIONS = {
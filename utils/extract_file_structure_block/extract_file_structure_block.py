@@ -21,38 +21,38 @@ TREE_LIKE_PATTERN = re.compile(
     re.IGNORECASE
 )
 
-STRUCTURE_KEYWORDS = {"structure", "file structure", "folder structure", "directory structure", "project structure"}
+# Single pattern covering "structure", "file structure", "folder structure", etc.
+# One C-level scan instead of iterating a keyword set per heading.
+STRUCTURE_HEADING_PATTERN = re.compile(r"(?:file|folder|directory|project)?\s*structure", re.IGNORECASE)
 
 def is_structure_heading(content: str) -> bool:
-    if not content:
-        return False
-    
-    content_lower = content.lower().strip()
-    
-    for keyword in STRUCTURE_KEYWORDS:
-        if keyword in content_lower:
-            return True
-    
-    words = content_lower.split()
-    if len(words) >= 2 and "structure" in words:
-        return True
-    
-    if "structure" in content_lower and len(content_lower) < 50:
-        return True
-    
-    return False
+    return (
+        content is not None
+        and bool(STRUCTURE_HEADING_PATTERN.search(content))
+        and len(content) < 80
+    )
+
+def find_structure_heading_index(tokens: List[Token]) -> Tuple[Optional[int], List[int]]:
+    """
+    Single pass over tokens: locate the structure heading and collect fence
+    token indices so later stages don't need to re-walk the token list.
+    """
+    heading_index = None
+    fence_indices: List[int] = []
 
-def find_structure_heading_index(tokens: List[Token]) -> Optional[int]:
     for i, token in enumerate(tokens):
-        if (token.type == "heading_open" and 
-            i + 1 < len(tokens) and 
-            tokens[i + 1].type == "inline"):
-            
+        if token.type == "fence":
+            fence_indices.append(i)
+        elif (heading_index is None and
+              token.type == "heading_open" and
+              i + 1 < len(tokens) and
+              tokens[i + 1].type == "inline"):
+
             heading_content = tokens[i + 1].content
             if is_structure_heading(heading_content):
-                return i
-    
-    return None
+                heading_index = i
+
+    return heading_index, fence_indices
 
 def extract_code_block_after_heading(tokens: List[Token], heading_index: int) -> Optional[str]:
     start_index = heading_index + 2
@@ -148,40 +148,44 @@ def extract_file_structure_block(md_text: str, tokens: List[Token]) -> Optional[
         return None
     
     try:
-        # Method 1: Token-based extraction
-        heading_index = find_structure_heading_index(tokens)
-        
+        # Method 1: Token-based extraction (also collects fence indices)
+        heading_index, fence_indices = find_structure_heading_index(tokens)
+
         if heading_index is not None:
             content = extract_code_block_after_heading(tokens, heading_index)
-            
+
             if content:
                 validated_content = validate_structure_content(content)
                 if validated_content:
                     return validated_content
-        
+
+        # No fences at all: the regex fallback can't match either, skip it
+        if not fence_indices:
+            logging.warning("❌ Could not find file structure block")
+            return None
+
         # Method 2: Regex fallback
         regex_content = fallback_regex_search(md_text)
         if regex_content:
             validated_content = validate_structure_content(regex_content)
             if validated_content:
                 return validated_content
-        
-        # Method 3: Generic code block search
-        for token in tokens:
-            if token.type == "fence":
-                content = token.content.strip()
-                if content:
-                    lines = content.splitlines()
-                    if len(lines) >= 3:
-                        structure_indicators = sum(
-                            1 for line in lines[:5] 
-                            if any(indicator in line for indicator in ["/", "│", "├", "└", "──"])
-                        )
-                        if structure_indicators >= 2:
-                            validated_content = validate_structure_content(content)
-                            if validated_content:
-                                return validated_content
-        
+
+        # Method 3: Generic code block search over the collected fences
+        for fence_index in fence_indices:
+            content = tokens[fence_index].content.strip()
+            if content:
+                lines = content.splitlines()
+                if len(lines) >= 3:
+                    structure_indicators = sum(
+                        1 for line in lines[:5]
+                        if any(indicator in line for indicator in ["/", "│", "├", "└", "──"])
+                    )
+                    if structure_indicators >= 2:
+                        validated_content = validate_structure_content(content)
+                        if validated_content:
+                            return validated_content
+
         logging.warning("❌ Could not find file structure block")
         return None
         
@@ -203,9 +207,9 @@ def debug_file_structure_extraction(md_text: str, tokens: List[Token]) -> dict:
         "success": False
     }
     
-    debug_info["code_blocks_found"] = sum(1 for token in tokens if token.type == "fence")
-    
-    heading_index = find_structure_heading_index(tokens)
+    heading_index, fence_indices = find_structure_heading_index(tokens)
+    debug_info["code_blocks_found"] = len(fence_indices)
+
     if heading_index is not None:
         debug_info["has_structure_heading"] = True
         debug_info["heading_content"] = tokens[heading_index + 1].content if heading_index + 1 < len(tokens) else None
@@ -54,75 +54,99 @@ def should_skip_heading(heading_text: str, file_names: Set[str]) -> bool:
     
     return False
 
-def extract_heading_content(tokens: List[Token], start_index: int) -> List[str]:
+def build_close_index(tokens: List[Token]) -> List[int]:
+    """
+    Build a matching-close index in one stack pass over the tokens:
+    close_idx[i] is the index of the *_close token matching the *_open
+    token at i, or -1 if there is none. Lets container handlers jump to
+    their close in O(1) instead of rescanning.
+
+    Args:
+        tokens: List of markdown tokens
+
+    Returns:
+        List mapping open-token indices to their close-token indices
+    """
+    close_idx = [-1] * len(tokens)
+    stack: List[int] = []
+
+    for i, token in enumerate(tokens):
+        if token.nesting == 1:
+            stack.append(i)
+        elif token.nesting == -1 and stack:
+            close_idx[stack.pop()] = i
+
+    return close_idx
+
+def extract_heading_content(tokens: List[Token], start_index: int, close_idx: Optional[List[int]] = None) -> List[str]:
     """
     Extract content under a heading until the next heading.
-    
+
     Args:
         tokens: List of markdown tokens
         start_index: Starting index after the heading
-        
+        close_idx: Precomputed matching-close index (built on demand if omitted)
+
     Returns:
         List of content lines
     """
+    if close_idx is None:
+        close_idx = build_close_index(tokens)
+
     content_lines = []
     i = start_index
     n = len(tokens)
-    
+
     while i < n and tokens[i].type != "heading_open":
         token = tokens[i]
-        
+
         if token.type == "inline":
             content_lines.append(token.content)
-            
+
         elif token.type == "fence":
             # Handle code blocks
             info = getattr(token, "info", "") or ""
             code_content = token.content.rstrip()
             fence_block = f"```{info}\n{code_content}\n```"
             content_lines.append(fence_block)
-            
+
         elif token.type == "paragraph_open":
             # Handle paragraphs
             if i + 1 < n and tokens[i + 1].type == "inline":
                 content_lines.append(tokens[i + 1].content)
-            # Skip to paragraph close
-            j = i + 1
-            while j < n and tokens[j].type != "paragraph_close":
-                j += 1
-            i = j
-            
+            # Jump to paragraph close
+            if close_idx[i] != -1:
+                i = close_idx[i]
+
         elif token.type in {"bullet_list_open", "ordered_list_open"}:
-            # Handle lists
-            j = i
-            while j < n and tokens[j].type not in {"bullet_list_close", "ordered_list_close"}:
+            # Handle lists: collect inline items up to the matching close
+            end = close_idx[i] if close_idx[i] != -1 else n
+            for j in range(i + 1, end):
                 if tokens[j].type == "inline":
                     content_lines.append(f"• {tokens[j].content}")
-                j += 1
-            i = j
-            
+            i = end if end < n else n - 1
+
         elif token.type == "blockquote_open":
             # Handle blockquotes
             if i + 1 < n and tokens[i + 1].type == "inline":
                 content_lines.append(f"> {tokens[i + 1].content}")
-            j = i + 1
-            while j < n and tokens[j].type != "blockquote_close":
-                j += 1
-            i = j
-        
+            if close_idx[i] != -1:
+                i = close_idx[i]
+
         i += 1
-    
+
     return content_lines
 
-def process_heading_section(tokens: List[Token], i: int, file_names: Set[str]) -> tuple[Optional[str], int]:
+def process_heading_section(tokens: List[Token], i: int, file_names: Set[str], close_idx: Optional[List[int]] = None) -> tuple[Optional[str], int]:
     """
     Process a heading section and extract its content if not skipped.
-    
+
     Args:
         tokens: List of markdown tokens
         i: Current token index
         file_names: Set of file names to exclude
-        
+        close_idx: Precomputed matching-close index for the tokens
+
     Returns:
         Tuple of (section_content, new_index)
     """
@@ -154,7 +178,7 @@ def process_heading_section(tokens: List[Token], i: int, file_names: Set[str]) -
         heading_line = heading_text
     
     # Extract content under this heading
-    content_lines = extract_heading_content(tokens, i + 2)
+    content_lines = extract_heading_content(tokens, i + 2, close_idx)
     
     if not content_lines:
         logging.debug(f"📝 Empty section under heading: {heading_text}")
@@ -228,16 +252,19 @@ def extract_project_readme(tokens: List[Token], tree_entries: List[str],
         # Extract file names to exclude
         file_names = extract_file_names(tree_entries, files_always, dirs_always)
         logging.debug(f"📋 Excluding {len(file_names)} file-specific sections")
-        
+
+        # One stack pass so container close lookups are O(1) in every section
+        close_idx = build_close_index(tokens)
+
         out_sections: List[str] = []
         i = 0
         n = len(tokens)
-        
+
         while i < n:
             token = tokens[i]
-            
+
             if token.type == "heading_open":
-                section_content, new_index = process_heading_section(tokens, i, file_names)
+                section_content, new_index = process_heading_section(tokens, i, file_names, close_idx)
                 if section_content:
                     out_sections.append(section_content)
                 i = new_index
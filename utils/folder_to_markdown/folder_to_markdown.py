@@ -1,13 +1,14 @@
+import io
 from pathlib import Path
 from typing import List, Tuple, Set, Optional
 import logging
 
-from ..constants import DEFAULT_IGNORE_PATTERNS
-from .utils.pattern_matcher import load_gitignore_patterns
+from .utils.pattern_matcher import load_gitignore_patterns, compile_ignore_regexes
 from .utils.tree_builder import build_ascii_tree
 from .utils.file_processor import collect_files
 from .utils.markdown_generator import generate_markdown_content
 from .utils.structure_comparator import compare_structure
+from utils.is_probably_file.is_probably_file import normalize_name_sets
 
 def folder_to_markdown(
     folder: Path,
@@ -27,11 +28,15 @@ def folder_to_markdown(
     
     # Default configurations
     files_always = files_always or {
-        "dockerfile", "makefile", "readme", "readme.md", "license", 
+        "dockerfile", "makefile", "readme", "readme.md", "license",
         ".gitignore", ".eslintrc", ".editorconfig", ".prettierrc"
     }
     dirs_always = dirs_always or set()
 
+    # Lowercase and freeze once so every is_probably_file call downstream
+    # skips per-call set normalization
+    files_always, dirs_always = normalize_name_sets(files_always, dirs_always)
+
     # Validation
     if not folder.is_dir():
         error_msg = f"❌ Input {folder} is not a directory"
@@ -39,36 +44,38 @@ def folder_to_markdown(
         logging.error(error_msg)
         return [], warnings
 
-    # Combine ignore patterns
-    ignore_globs = DEFAULT_IGNORE_PATTERNS[:]
-    if user_ignore:
-        ignore_globs.extend(user_ignore)
-    
     # Load .gitignore patterns
     gitignore_path = folder / ".gitignore"
-    gitignore_ignores, gitignore_unignores = load_gitignore_patterns(gitignore_path)
+    gitignore_ignores, gitignore_unignores, anchored_dirs = load_gitignore_patterns(gitignore_path)
+
+    # Merge defaults, user patterns and .gitignore into a literal-name set
+    # plus single compiled regexes
+    literal_ignores, ignore_regex, unignore_regex = compile_ignore_regexes(
+        user_ignore or [], gitignore_ignores, gitignore_unignores
+    )
 
     # Build ASCII tree
-    tree_lines = build_ascii_tree(
-        folder, gitignore_ignores, gitignore_unignores, 
-        files_always, dirs_always, max_depth
+    tree_lines, dir_count = build_ascii_tree(
+        folder, literal_ignores, ignore_regex, unignore_regex,
+        files_always, dirs_always, max_depth, anchored_dirs
     )
 
     # Collect files
     files_to_write, collect_warnings = collect_files(
-        folder, gitignore_ignores, gitignore_unignores,
-        files_always, dirs_always, max_file_size
+        folder, literal_ignores, ignore_regex, unignore_regex,
+        files_always, dirs_always, max_file_size, anchored_dirs
     )
     warnings.extend(collect_warnings)
     
     file_list = [rel_path for rel_path, _, _ in files_to_write]
 
     # Generate and write Markdown content
-    md_content = generate_markdown_content(folder, tree_lines, files_to_write, warnings)
-    
+    buf = io.StringIO()
+    generate_markdown_content(buf, folder, tree_lines, dir_count, files_to_write, warnings)
+
     try:
         output_md.parent.mkdir(parents=True, exist_ok=True)
-        output_md.write_text("\n".join(md_content), encoding="utf-8")
+        output_md.write_text(buf.getvalue(), encoding="utf-8")
         logging.info(f"✅ Wrote Markdown to {output_md} ({len(files_to_write)} files)")
     except Exception as e:
         error_msg = f"❌ Failed to write {output_md}: {str(e)}"
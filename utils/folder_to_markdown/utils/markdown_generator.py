@@ -1,45 +1,44 @@
 """Markdown content generation utilities."""
+import io
 from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime
 
 def generate_markdown_content(
+    out: io.StringIO,
     folder: Path,
     tree_lines: List[str],
+    dir_count: int,
     files_to_write: List[Tuple[str, str, str]],
     warnings: List[str]
-) -> List[str]:
+) -> None:
     """
-    Generate complete Markdown content from folder structure and files.
+    Generate complete Markdown content from folder structure and files,
+    writing directly into `out` to avoid building an intermediate line list.
     """
-    md_content = [
-        "# Generated Folder Structure",
-        f"*Generated from: `{folder}`*",
-        f"*Timestamp: {datetime.now().isoformat()}*",
-        "",
-        "## File Structure",
-        "```text"
-    ]
-    
-    full_tree_for_display = [f"{folder.name}/"] + tree_lines
-    md_content.extend(full_tree_for_display)
-    md_content.append("```")
+    write = out.write
+    write("# Generated Folder Structure\n")
+    write(f"*Generated from: `{folder}`*\n")
+    write(f"*Timestamp: {datetime.now().isoformat()}*\n")
+    write("\n")
+    write("## File Structure\n")
+    write("```text\n")
+
+    write(f"{folder.name}/\n")
+    for line in tree_lines:
+        write(line)
+        write("\n")
+    write("```\n")
 
     # Add file contents
     for rel_path, lang, content in sorted(files_to_write, key=lambda x: x[0].lower()):
-        md_content.extend([
-            f"\n## {rel_path}",
-            f"```{lang}",
-            content,
-            "```"
-        ])
+        write(f"\n## {rel_path}\n")
+        write(f"```{lang}\n")
+        write(content)
+        write("\n```\n")
 
     # Add summary
-    md_content.extend([
-        "\n## Summary",
-        f"- Total files: {len(files_to_write)}",
-        f"- Total directories: {len([l for l in tree_lines if l.endswith('/')])}",
-        f"- Warnings: {len(warnings)}"
-    ])
-    
-    return md_content
\ No newline at end of file
+    write("\n## Summary\n")
+    write(f"- Total files: {len(files_to_write)}\n")
+    write(f"- Total directories: {dir_count}\n")
+    write(f"- Warnings: {len(warnings)}")
@@ -1,51 +1,177 @@
 """Pattern matching utilities for ignore patterns."""
 from pathlib import Path
-from typing import Set, Tuple, Pattern
+from typing import Optional, Set, Tuple, Pattern
 import re
-import fnmatch
 import logging
 from functools import lru_cache
 
-from ...constants import DEFAULT_IGNORE_PATTERNS, EXPLICIT_IGNORE_DIRS  
+from ...constants import DEFAULT_IGNORE_PATTERNS, EXPLICIT_IGNORE_DIRS_LOWER
+
+# Matches an unescaped "(" that does not already start an extension group
+_CAPTURING_GROUP_RE = re.compile(r'(?<!\\)\((?!\?)')
+
+def _translate_glob(pat: str) -> str:
+    """
+    Single-pass glob-to-regex translator replacing fnmatch.translate,
+    modeled on CPython 3.13's rewritten algorithm: consecutive '*' runs
+    collapse to one '.*' and the output is built in one scan. '*' keeps
+    fnmatch semantics (it crosses '/') because the default patterns rely
+    on '*.ext' matching nested paths.
+    """
+    res = []
+    add = res.append
+    i, n = 0, len(pat)
+    star_pending = False
+
+    while i < n:
+        c = pat[i]
+        i += 1
+        if c == '*':
+            star_pending = True
+            continue
+        if star_pending:
+            add('.*')
+            star_pending = False
+        if c == '?':
+            add('.')
+        elif c == '[':
+            j = i
+            if j < n and pat[j] == '!':
+                j += 1
+            if j < n and pat[j] == ']':
+                j += 1
+            while j < n and pat[j] != ']':
+                j += 1
+            if j >= n:
+                add('\\[')
+            else:
+                stuff = pat[i:j].replace('\\', r'\\')
+                i = j + 1
+                if stuff:
+                    if stuff[0] == '!':
+                        stuff = '^' + stuff[1:]
+                    elif stuff[0] in ('^', '['):
+                        stuff = '\\' + stuff
+                add(f'[{stuff}]')
+        else:
+            add(re.escape(c))
+
+    if star_pending:
+        add('.*')
+    return r'(?s:%s)\Z' % ''.join(res)
 
 @lru_cache(maxsize=1024)
 
-def load_gitignore_patterns(gitignore_path: Path) -> Tuple[Set[Pattern], Set[Pattern]]:
+def load_gitignore_patterns(gitignore_path: Path) -> Tuple[Set[Pattern], Set[Pattern], frozenset]:
     """
-    Load .gitignore patterns, separating ignores and un-ignores (!patterns).
-    Returns compiled regex patterns for efficient matching.
+    Load .gitignore patterns, separating ignores, un-ignores (!patterns) and
+    root-anchored directory names (e.g. "/build"). Anchored names go into a
+    frozenset so whole subtrees can be rejected with a hash lookup instead
+    of regex matching during the walk.
     """
     ignores: Set[Pattern] = set()
     unignores: Set[Pattern] = set()
-    
+    anchored_dirs: Set[str] = set()
+
     if not gitignore_path.exists():
-        return ignores, unignores
-        
+        return ignores, unignores, frozenset()
+
     try:
         with gitignore_path.open("r", encoding="utf-8", errors="replace") as f:
             for line_num, line in enumerate(f, 1):
                 line = line.strip()
                 if not line or line.startswith("#"):
                     continue
-                    
+
                 if line.startswith("!"):
                     pattern = pattern_to_regex(line[1:])
                     if pattern.pattern != r'(?!x)x':  # Skip invalid patterns
                         unignores.add(pattern)
-                else:
-                    pattern = pattern_to_regex(line)
-                    if pattern.pattern != r'(?!x)x':  # Skip invalid patterns
-                        ignores.add(pattern)
-                        
+                    continue
+
+                # Root-anchored single-component name: "/build" or "/build/"
+                if line.startswith("/"):
+                    name = line[1:].rstrip("/")
+                    if name and '/' not in name and not (_GLOB_METACHARS & set(name)):
+                        anchored_dirs.add(name)
+                        continue
+
+                pattern = pattern_to_regex(line)
+                if pattern.pattern != r'(?!x)x':  # Skip invalid patterns
+                    ignores.add(pattern)
+
     except Exception as e:
         logging.warning(f"⚠️ Failed to parse .gitignore at {gitignore_path}: {e}")
-        
-    return ignores, unignores
+
+    return ignores, unignores, frozenset(anchored_dirs)
 
 def get_default_ignore_patterns() -> Set[Pattern]:
     """Get pre-compiled default ignore patterns."""
     return {pattern_to_regex(pat) for pat in DEFAULT_IGNORE_PATTERNS}
 
+def merge_patterns(patterns) -> Optional[Pattern]:
+    """
+    Union compiled patterns into a single alternation regex so each path is
+    checked with one C-level match instead of an N-pattern Python loop.
+    """
+    sources = [p.pattern for p in patterns if p.pattern != r'(?!x)x']
+    if not sources:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{src})" for src in sources))
+    except re.error as e:
+        logging.warning(f"⚠️ Failed to merge ignore patterns, falling back to per-pattern matching: {e}")
+        return None
+
+_GLOB_METACHARS = frozenset('*?[!')
+
+def _split_literals(patterns) -> Tuple[frozenset, list]:
+    """
+    Separate plain filename patterns (no glob metachars, no '/') from ones
+    that need regex matching. Literals match a rel_path exactly, so a set
+    lookup replaces the regex probe for them.
+    """
+    literals = set()
+    globs = []
+    for pat in patterns:
+        pat = pat.strip()
+        if not pat or pat.startswith('#'):
+            continue
+        if '/' not in pat and not (_GLOB_METACHARS & set(pat)):
+            literals.add(pat)
+        else:
+            globs.append(pat)
+    return frozenset(literals), globs
+
+@lru_cache(maxsize=1)
+def _default_split() -> Tuple[frozenset, Tuple[Pattern, ...]]:
+    """Split and translate DEFAULT_IGNORE_PATTERNS once per process."""
+    literals, globs = _split_literals(DEFAULT_IGNORE_PATTERNS)
+    return literals, tuple(pattern_to_regex(pat) for pat in globs)
+
+def compile_ignore_regexes(
+    user_globs,
+    gitignore_ignores: Set[Pattern],
+    gitignore_unignores: Set[Pattern]
+) -> Tuple[frozenset, Optional[Pattern], Optional[Pattern]]:
+    """
+    Compile default + user glob patterns and .gitignore patterns into a
+    literal-name set plus one merged ignore regex and one merged unignore
+    regex ("compile once, match many"). The default patterns are translated
+    once per process and reused.
+    """
+    default_literals, default_regexes = _default_split()
+    user_literals, user_glob_pats = _split_literals(user_globs)
+
+    ignore_compiled = list(default_regexes)
+    ignore_compiled.extend(pattern_to_regex(pat) for pat in user_glob_pats)
+    ignore_compiled.extend(gitignore_ignores)
+    return (
+        default_literals | user_literals,
+        merge_patterns(ignore_compiled),
+        merge_patterns(gitignore_unignores),
+    )
+
 def pattern_to_regex(pattern: str) -> Pattern:
     """
     Convert .gitignore or glob pattern to compiled regex pattern.
@@ -60,12 +186,16 @@ def pattern_to_regex(pattern: str) -> Pattern:
     if is_dir_pattern:
         pattern = pattern[:-1]
     
-    # Convert to regex using fnmatch
-    regex_pattern = fnmatch.translate(pattern)
-    
+    # Convert to regex with the single-pass translator
+    regex_pattern = _translate_glob(pattern)
+
+    # Demote any capturing groups to non-capturing: the matcher never reads
+    # groups, and captures cost regex-engine work in the merged union
+    regex_pattern = _CAPTURING_GROUP_RE.sub('(?:', regex_pattern)
+
     # Handle directory matching - directory and all its contents
     if is_dir_pattern or '/' in pattern:
-        regex_pattern = regex_pattern.replace(r'\Z', r'(/.*)?\Z')
+        regex_pattern = regex_pattern.replace(r'\Z', r'(?:/.*)?\Z')
     
     try:
         return re.compile(regex_pattern)
@@ -75,27 +205,39 @@ def pattern_to_regex(pattern: str) -> Pattern:
 
 def should_ignore_path(
     rel_path: str,
-    ignore_patterns: Set[Pattern],
-    unignore_patterns: Set[Pattern],
-    default_ignore_patterns: Set[Pattern]
+    literal_ignores: frozenset,
+    ignore_regex: Optional[Pattern],
+    unignore_regex: Optional[Pattern],
+    anchored_dirs: frozenset = frozenset()
 ) -> bool:
     """
-    Determine if a path should be ignored based on patterns.
-    Unignore patterns take precedence over ignore patterns.
+    Determine if a path should be ignored based on the literal-name set,
+    root-anchored directory names and merged pattern regexes. Unignore
+    patterns take precedence over ignore patterns.
     """
+    # No patterns at all: only the explicit-dir check applies
+    if not literal_ignores and not anchored_dirs and ignore_regex is None and unignore_regex is None:
+        return any(part.lower() in EXPLICIT_IGNORE_DIRS_LOWER for part in rel_path.split("/"))
+
     # Check if explicitly un-ignored
-    if any(pattern.match(rel_path) for pattern in unignore_patterns):
+    if unignore_regex is not None and unignore_regex.match(rel_path):
         return False
-    
-    # NEW: Check explicit directory names (case-insensitive)
-    path_obj = Path(rel_path)
-    for part in path_obj.parts:
-        if part.lower() in [d.lower() for d in EXPLICIT_IGNORE_DIRS]:
-            return True
-    
+
+    # Literal filename fast path: a set lookup beats the regex union
+    if rel_path in literal_ignores:
+        return True
+
+    # Root-anchored directories reject their whole subtree with one lookup
+    if anchored_dirs and rel_path.split("/", 1)[0] in anchored_dirs:
+        return True
+
+    # NEW: Check explicit directory names (case-insensitive); rel paths are
+    # already /-normalized, so a plain split avoids the PurePath allocation
+    if any(part.lower() in EXPLICIT_IGNORE_DIRS_LOWER for part in rel_path.split("/")):
+        return True
+
     # Check if ignored by default or custom patterns
-    all_ignore_patterns = default_ignore_patterns | ignore_patterns
-    if any(pattern.match(rel_path) for pattern in all_ignore_patterns):
+    if ignore_regex is not None and ignore_regex.match(rel_path):
         return True
-    
+
     return False
\ No newline at end of file
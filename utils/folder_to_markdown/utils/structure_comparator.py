@@ -41,13 +41,14 @@ def compare_file_sets(
     warnings: List[str]
 ) -> None:
     """Compare parsed files from markdown with generated file list."""
-    folder_name = folder.name
+    prefix = folder.name + '/'
+    plen = len(prefix)
     parsed_set = set()
     for file_path in parsed_files:
         if is_probably_file(Path(file_path).name, files_always, dirs_always):
             # Remove folder name prefix if present
-            if file_path.startswith(folder_name + '/'):
-                parsed_set.add(file_path[len(folder_name) + 1:])
+            if file_path.startswith(prefix):
+                parsed_set.add(file_path[plen:])
             else:
                 parsed_set.add(file_path)
 
@@ -72,12 +73,14 @@ def verify_output_structure(
     code_map = {rel_path: [content] for rel_path, _, content in files_to_write}
     verify_warnings: List[str] = []
     
+    # rsplit on the stripped line replaces per-line Path construction; the
+    # result stays a list because verify_output takes len() of it
     file_tree_lines = [
-        f for f in tree_lines 
+        f for f in tree_lines
         if not f.startswith("#") and is_probably_file(
-            Path(f.strip("├──└── │")).name, files_always, dirs_always
+            f.strip("├──└── │ ").rstrip("/").rsplit("/", 1)[-1], files_always, dirs_always
         )
     ]
-    
+
     verify_output(folder, file_tree_lines, code_map, verify_warnings)
     warnings.extend(verify_warnings)
\ No newline at end of file
@@ -1,78 +1,105 @@
 """ASCII tree building utilities."""
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set, Pattern
+from typing import List, Optional, Set, Pattern, Tuple
 import logging
 
 # Import from project utils (assuming these exist in your project)
 from utils.is_probably_file.is_probably_file import is_probably_file
 
-from .pattern_matcher import should_ignore_path, get_default_ignore_patterns
-from ...constants import EXPLICIT_IGNORE_DIRS  # NEW: Import explicit ignore dirs
+from .pattern_matcher import should_ignore_path
+from ...constants import EXPLICIT_IGNORE_DIRS_LOWER  # NEW: Import explicit ignore dirs
+
+# Branch connectors, preconstructed once
+_CONNECTOR_LAST = "└── "
+_CONNECTOR_MID = "├── "
+_PREFIX_LAST = "    "
+_PREFIX_MID = "│   "
 
 def build_ascii_tree(
     root: Path,
-    ignore_patterns: Set[Pattern],
-    unignore_patterns: Set[Pattern],
+    literal_ignores: frozenset,
+    ignore_regex: Optional[Pattern],
+    unignore_regex: Optional[Pattern],
     files_always: Set[str],
     dirs_always: Set[str],
-    max_depth: int = 20
-) -> List[str]:
+    max_depth: int = 20,
+    anchored_dirs: frozenset = frozenset()
+) -> Tuple[List[str], int]:
     """
     Generate ASCII tree representation of directory structure, excluding ignored paths.
+    Returns the tree lines and the number of directory entries, counted during
+    the walk so callers don't need a second pass over the lines.
     """
-    default_ignore_patterns = get_default_ignore_patterns()
-    
-    def _walk_dir(path: Path, prefix: str = "", depth: int = 0) -> List[str]:
+    dir_count = 0
+
+    # The pattern state is fixed for the whole build, so memoize on just the
+    # rel_path string; repeated prefixes across siblings become cache hits
+    @lru_cache(maxsize=None)
+    def _should_ignore(rel_path: str) -> bool:
+        return should_ignore_path(rel_path, literal_ignores, ignore_regex, unignore_regex, anchored_dirs)
+
+    def _walk_dir(path: str, prefix: str = "", depth: int = 0, parent_rel: str = "") -> List[str]:
+        nonlocal dir_count
         if depth > max_depth:
             return []
-            
+
         lines = []
         try:
-            entries = sorted(path.iterdir(), key=lambda x: (not x.is_dir(), x.name.lower()))
+            # os.scandir caches is_dir() on the DirEntry, avoiding the
+            # repeated stat calls pathlib.iterdir incurs per entry
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower()))
         except PermissionError as e:
             return []
         except Exception as e:
             return []
 
-        # Filter out ignored entries first
+        # Filter out ignored entries first, building rel paths incrementally
+        # instead of re-deriving them via entry.relative_to(root)
         valid_entries = []
         for entry in entries:
-            rel_path = str(entry.relative_to(root)).replace("\\", "/")
-            
+            rel_path = parent_rel + entry.name if parent_rel else entry.name
+
             # PERMANENT FIX: Explicitly ignore directories in EXPLICIT_IGNORE_DIRS
-            if entry.is_dir() and entry.name.lower() in [d.lower() for d in EXPLICIT_IGNORE_DIRS]:
+            if entry.is_dir(follow_symlinks=False) and entry.name.lower() in EXPLICIT_IGNORE_DIRS_LOWER:
                 continue
-                
-            if not should_ignore_path(rel_path, ignore_patterns, unignore_patterns, default_ignore_patterns):
-                valid_entries.append(entry)
+
+            if not _should_ignore(rel_path):
+                valid_entries.append((entry, rel_path))
 
         # If no valid entries after filtering, don't show this directory at all
         if not valid_entries:
             return []
 
-        for i, entry in enumerate(valid_entries):
+        for i, (entry, rel_path) in enumerate(valid_entries):
             is_last = i == len(valid_entries) - 1
             name = entry.name
-            rel_path = str(entry.relative_to(root)).replace("\\", "/")
 
             # Determine if entry is a file or directory
             is_file = is_probably_file(name, files_always, dirs_always)
-            connector = "└── " if is_last else "├── "
-            entry_suffix = '/' if entry.is_dir() and not is_file else ''
-            lines.append(f"{prefix}{connector}{name}{entry_suffix}")
+            connector = _CONNECTOR_LAST if is_last else _CONNECTOR_MID
+            entry_suffix = '/' if entry.is_dir(follow_symlinks=False) and not is_file else ''
+            if entry_suffix:
+                dir_count += 1
+            # join on a small tuple beats f-string formatting for short strings
+            lines.append("".join((prefix, connector, name, entry_suffix)))
 
             # Recurse into directories
-            if entry.is_dir() and not is_file:
-                new_prefix = prefix + ("    " if is_last else "│   ")
-                child_lines = _walk_dir(entry, new_prefix, depth + 1)
+            if entry.is_dir(follow_symlinks=False) and not is_file:
+                new_prefix = prefix + (_PREFIX_LAST if is_last else _PREFIX_MID)
+                child_lines = _walk_dir(entry.path, new_prefix, depth + 1, rel_path + "/")
                 # Only add this directory if it has visible children
                 if child_lines:
                     lines.extend(child_lines)
-        
+
         return lines
 
     try:
-        tree_lines = _walk_dir(root)
-        return tree_lines if tree_lines else ["# Empty directory"]
+        tree_lines = _walk_dir(str(root))
+        if not tree_lines:
+            return ["# Empty directory"], 0
+        return tree_lines, dir_count
     except Exception as e:
-        return ["# Error building directory tree"]
\ No newline at end of file
+        return ["# Error building directory tree"], 0
\ No newline at end of file
@@ -4,19 +4,55 @@ import logging
 import re
 from functools import lru_cache
 
+# Pre-compile whitespace collapsing regex for performance
+_WS_RE = re.compile(r'\s+')
+
+@lru_cache(maxsize=256)
 def normalize_string(text: str) -> str:
     """
     Normalize string for comparison by lowercasing and removing extra spaces.
-    
+    Cached because fence info strings repeat heavily across code blocks.
+
     Args:
         text: Input string to normalize
-        
+
     Returns:
         Normalized string
     """
     if not text:
         return ""
-    return re.sub(r'\s+', ' ', text.strip().lower())
+    return _WS_RE.sub(' ', text.strip().lower())
+
+# Extensions stripped when generating filename variations
+_VARIATION_EXTS = ('.py', '.js', '.ts', '.json', '.md', '.txt', '.yml', '.yaml', '.xml', '.html', '.css')
+
+@lru_cache(maxsize=1024)
+def filename_matches_variation(filename: str, target: str) -> bool:
+    """
+    Early-exit equivalent of `target in get_filename_variations(filename)`:
+    each variation is compared as it is derived, so no set is built when the
+    first few checks already decide the answer.
+
+    Args:
+        filename: Original filename
+        target: Normalized fence info to compare against
+
+    Returns:
+        True if any variation of filename equals target
+    """
+    name_lower = filename.lower()
+    if name_lower == target:
+        return True
+    if name_lower.replace('_', '').replace('-', '') == target:
+        return True
+    if name_lower.replace('_', '-') == target:
+        return True
+    if name_lower.replace('-', '_') == target:
+        return True
+    for ext in _VARIATION_EXTS:
+        if name_lower.endswith(ext) and name_lower[:-len(ext)] == target:
+            return True
+    return False
 
 @lru_cache(maxsize=100)
 def get_filename_variations(filename: str) -> Set[str]:
@@ -39,87 +75,100 @@ def get_filename_variations(filename: str) -> Set[str]:
     variations.add(name_lower.replace('-', '_'))
     
     # Remove common extensions for matching
-    for ext in ['.py', '.js', '.ts', '.json', '.md', '.txt', '.yml', '.yaml', '.xml', '.html', '.css']:
+    for ext in _VARIATION_EXTS:
         if name_lower.endswith(ext):
             variations.add(name_lower[:-len(ext)])
     
     return variations
 
-def exact_match_candidates(info_clean: str, tree_entries: List[str]) -> List[str]:
+def prepare_tree_entries(tree_entries: List[str]) -> List[tuple]:
+    """
+    Lowercase each tree entry once, returning (original, lower_path,
+    lower_basename) tuples so the match loops never re-lower or re-split
+    per fence info.
+
+    Args:
+        tree_entries: List of file paths
+
+    Returns:
+        List of (original, lower_path, lower_basename) tuples
+    """
+    prepared = []
+    for file_path in tree_entries:
+        filepath_lower = file_path.lower()
+        prepared.append((file_path, filepath_lower, filepath_lower.rsplit("/", 1)[-1]))
+    return prepared
+
+def exact_match_candidates(info_clean: str, prepared_entries: List[tuple]) -> List[str]:
     """
     Find exact match candidates.
-    
+
     Args:
         info_clean: Normalized fence info
-        tree_entries: List of file paths
-        
+        prepared_entries: Output of prepare_tree_entries
+
     Returns:
         List of exact match candidates
     """
     candidates = []
-    
-    for file_path in tree_entries:
-        path = Path(file_path)
-        
-        # Exact filename match
-        if path.name.lower() == info_clean:
-            candidates.append(file_path)
-            continue
-            
-        # Exact path match (without extension considerations)
-        if file_path.lower() == info_clean:
+
+    for file_path, filepath_lower, filename_lower in prepared_entries:
+        # Exact filename or exact path match
+        if filename_lower == info_clean or filepath_lower == info_clean:
             candidates.append(file_path)
-    
+
     return candidates
 
-def partial_match_candidates(info_clean: str, tree_entries: List[str]) -> List[str]:
+def partial_match_candidates(info_clean: str, prepared_entries: List[tuple]) -> List[str]:
     """
     Find partial match candidates with scoring.
-    
+
     Args:
         info_clean: Normalized fence info
-        tree_entries: List of file paths
-        
+        prepared_entries: Output of prepare_tree_entries
+
     Returns:
         List of partial match candidates with scores
     """
     scored_candidates = []
-    
-    for file_path in tree_entries:
-        path = Path(file_path)
-        filename_lower = path.name.lower()
-        filepath_lower = file_path.lower()
-        
+
+    for file_path, filepath_lower, filename_lower in prepared_entries:
+
+        # Coarse prefilter: the cheap substring test rejects most entries
+        # before any scoring or variation work happens
+        in_path = info_clean in filepath_lower
+        if not in_path and not filename_matches_variation(filename_lower, info_clean):
+            continue
+
         score = 0
-        
+
         # High score: info is contained in filename
         if info_clean in filename_lower:
             score += 3
-            
+
             # Bonus: info matches start of filename
             if filename_lower.startswith(info_clean):
                 score += 2
-                
+
             # Bonus: exact match with different extension
-            name_without_ext = path.stem.lower()
+            dot = filename_lower.rfind(".")
+            name_without_ext = filename_lower[:dot] if dot > 0 else filename_lower
             if name_without_ext == info_clean:
                 score += 2
-        
+
         # Medium score: info is contained in full path
-        elif info_clean in filepath_lower:
+        elif in_path:
             score += 1
-            
-            # Bonus: info matches directory name
-            for parent in path.parents:
-                if parent.name.lower() == info_clean:
-                    score += 1
-                    break
-        
+
+            # Bonus: info matches a directory component; the slash-bounded
+            # substring test avoids building a PurePath per candidate
+            if f"/{info_clean}/" in f"/{filepath_lower}":
+                score += 1
+
         # Check filename variations
-        filename_variations = get_filename_variations(path.name)
-        if info_clean in filename_variations:
+        if filename_matches_variation(filename_lower, info_clean):
             score += 2
-        
+
         if score > 0:
             scored_candidates.append((file_path, score))
     
@@ -140,28 +189,23 @@ def validate_candidates(candidates: List[str], info_clean: str) -> List[str]:
     """
     if not candidates:
         return []
-    
+
+    multiple = len(candidates) > 1
     valid_candidates = []
-    
+
     for candidate in candidates:
-        path = Path(candidate)
-        
-        # Skip directories (unless they match exactly and are meaningful)
-        if path.suffix == '' and len(candidates) > 1:
-            # Only include directories if they're the only match or have high relevance
-            continue
-            
+        # Skip directories (unless they match exactly and are meaningful);
+        # a basename rfind mirrors Path.suffix == '' without building a Path
+        if multiple:
+            basename = candidate.rsplit("/", 1)[-1]
+            if basename.rfind(".") <= 0:
+                # Only include directories if they're the only match or have high relevance
+                continue
+
         valid_candidates.append(candidate)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_candidates = []
-    for candidate in valid_candidates:
-        if candidate not in seen:
-            seen.add(candidate)
-            unique_candidates.append(candidate)
-    
-    return unique_candidates
+
+    # Remove duplicates while preserving order (C-level, order-stable)
+    return list(dict.fromkeys(valid_candidates))
 
 def infer_targets_from_fence_info(info: str, tree_entries: List[str]) -> List[str]:
     """
@@ -188,25 +232,31 @@ def infer_targets_from_fence_info(info: str, tree_entries: List[str]) -> List[st
         
         if not info_clean:
             return []
-        
+
+        # Lowercase the tree once; all match phases share the prepared copy
+        prepared_entries = prepare_tree_entries(tree_entries)
+
         # Step 1: Exact matches (highest confidence)
-        exact_matches = exact_match_candidates(info_clean, tree_entries)
+        exact_matches = exact_match_candidates(info_clean, prepared_entries)
         if exact_matches:
             logging.debug(f"✅ Found {len(exact_matches)} exact matches: {exact_matches}")
             return validate_candidates(exact_matches, info_clean)
-        
+
         # Step 2: Partial matches with scoring
-        partial_matches = partial_match_candidates(info_clean, tree_entries)
+        partial_matches = partial_match_candidates(info_clean, prepared_entries)
         if partial_matches:
             logging.debug(f"✅ Found {len(partial_matches)} partial matches: {partial_matches}")
             return validate_candidates(partial_matches, info_clean)
         
-        # Step 3: Try splitting info for complex cases (e.g., "python src/main.py")
+        # Step 3: Try splitting info for complex cases (e.g., "python src/main.py").
+        # Call the match helpers directly per part instead of recursing into the
+        # full function, which would re-normalize and re-validate on every part.
         if ' ' in info_clean:
-            parts = info_clean.split()
-            for part in parts:
+            for part in info_clean.split():
                 if len(part) > 2:  # Only consider meaningful parts
-                    part_matches = infer_targets_from_fence_info(part, tree_entries)
+                    part_matches = exact_match_candidates(part, prepared_entries)
+                    if not part_matches:
+                        part_matches = partial_match_candidates(part, prepared_entries)
                     if part_matches:
                         logging.debug(f"✅ Found {len(part_matches)} matches from split part '{part}': {part_matches}")
                         return validate_candidates(part_matches, info_clean)
@@ -235,7 +285,7 @@ def infer_targets_advanced(info: str, tree_entries: List[str],
     if strategy == "strict":
         # Only exact matches
         info_clean = normalize_string(info)
-        return exact_match_candidates(info_clean, tree_entries)
+        return exact_match_candidates(info_clean, prepare_tree_entries(tree_entries))
     
     elif strategy == "balanced":
         # Default balanced approach
@@ -287,8 +337,9 @@ def debug_fence_inference(info: str, tree_entries: List[str]) -> dict:
     
     if info and tree_entries:
         info_clean = normalize_string(info)
-        debug_info["exact_matches"] = exact_match_candidates(info_clean, tree_entries)
-        debug_info["partial_matches"] = partial_match_candidates(info_clean, tree_entries)
+        prepared_entries = prepare_tree_entries(tree_entries)
+        debug_info["exact_matches"] = exact_match_candidates(info_clean, prepared_entries)
+        debug_info["partial_matches"] = partial_match_candidates(info_clean, prepared_entries)
         debug_info["final_candidates"] = infer_targets_from_fence_info(info, tree_entries)
     
     return debug_info
\ No newline at end of file
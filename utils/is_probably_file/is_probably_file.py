@@ -4,6 +4,26 @@ import logging
 
 from utils.config.config import SPECIAL_FILES, is_special_file
 
+# Hidden names that look like dotfiles but are really directories
+_HIDDEN_DIRS = frozenset({".git", ".vscode", ".idea", ".venv", "node_modules"})
+
+# Common file-like names without extensions
+_FILE_LIKE_NAMES = frozenset({
+    "dockerfile", "makefile", "procfile", "license", "readme",
+    "changelog", "contributing", "authors", "code_of_conduct"
+})
+
+def normalize_name_sets(files_always: Optional[Set], dirs_always: Optional[Set]) -> tuple:
+    """
+    Lower and freeze the files_always/dirs_always override sets once so hot
+    loops can pass pre-normalized frozensets instead of paying the
+    lowercasing cost on every is_probably_file call.
+    """
+    return (
+        frozenset(x.lower() for x in (files_always or ())),
+        frozenset(x.lower() for x in (dirs_always or ())),
+    )
+
 def is_probably_file(name: str, files_always: Optional[Set] = None, dirs_always: Optional[Set] = None) -> bool:
     """
     Heuristic to decide whether a path segment is a file.
@@ -26,9 +46,12 @@ def is_probably_file(name: str, files_always: Optional[Set] = None, dirs_always:
         if not name:
             return False
         
-        # Normalize inputs
-        files_always = set(x.lower() for x in (files_always or set()))
-        dirs_always = set(x.lower() for x in (dirs_always or set()))
+        # Normalize inputs; frozensets are assumed pre-lowered via
+        # normalize_name_sets so repeat callers skip the rebuild entirely
+        if not isinstance(files_always, frozenset):
+            files_always = frozenset(x.lower() for x in (files_always or ()))
+        if not isinstance(dirs_always, frozenset):
+            dirs_always = frozenset(x.lower() for x in (dirs_always or ()))
         
         base = Path(name).name
         base_lower = base.lower()
@@ -49,24 +72,17 @@ def is_probably_file(name: str, files_always: Optional[Set] = None, dirs_always:
         if is_special_file(base):
             return True
         
-        # Common file extensions heuristic
-        if "." in base and len(base) > 1:
-            # Avoid false positives like hidden directories (.git, .vscode)
-            if base.startswith(".") and base.count(".") == 1:
-                # Could be hidden file or directory, use additional checks
-                if base_lower in {".git", ".vscode", ".idea", ".venv", "node_modules"}:
-                    return False
-                return True  # Most dotfiles are files
-            
-            # Regular files with extensions
+        # Common file extensions heuristic: one rfind covers both
+        # "name.ext" and multi-dot dotfiles like ".env.local"
+        dot = base.rfind(".")
+        if dot > 0:
             return True
-        
-        # Common file-like names without extensions
-        file_like_names = {
-            "dockerfile", "makefile", "procfile", "license", "readme", 
-            "changelog", "contributing", "authors", "code_of_conduct"
-        }
-        if base_lower in file_like_names:
+        if dot == 0 and len(base) > 1:
+            # Single-dot hidden name: most dotfiles are files, but avoid
+            # false positives on hidden directories (.git, .vscode)
+            return base_lower not in _HIDDEN_DIRS
+
+        if base_lower in _FILE_LIKE_NAMES:
             return True
         
         # Default to directory for ambiguous cases
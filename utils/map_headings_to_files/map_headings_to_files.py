@@ -1,7 +1,8 @@
-from typing import Dict, List, Tuple, Optional, Set, Any, Pattern
+from typing import Dict, List, Tuple, Optional, Set, FrozenSet, Any, Pattern
 from pathlib import Path
 from markdown_it.token import Token
-import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from textwrap import dedent as _dedent
 import re
 import difflib
 import logging
@@ -11,39 +12,67 @@ from utils.config.config import get_comment_prefix
 from utils.infer_targets_from_fence_info.infer_targets_from_fence_info import infer_targets_from_fence_info
 from utils.is_probably_file.is_probably_file import is_probably_file
 
+# Optional C-extension backend for fuzzy matching; difflib stays as the
+# pure-Python fallback so the dependency remains optional
+try:
+    from rapidfuzz import fuzz as _rf_fuzz, process as _rf_process
+except ImportError:
+    _rf_fuzz = None
+    _rf_process = None
+
 # ============================================================================
 # String Similarity Utilities
 # ============================================================================
 
-@lru_cache(maxsize=100)
 def calculate_string_similarity(str1: str, str2: str) -> float:
     """
     Calculate similarity ratio between two strings (0.0 to 1.0).
-    
+
     Args:
         str1: First string
         str2: Second string
-        
+
     Returns:
         Similarity ratio
     """
     if not str1 or not str2:
         return 0.0
+    if _rf_fuzz is not None:
+        return _rf_fuzz.ratio(str1.lower(), str2.lower()) / 100.0
     return difflib.SequenceMatcher(None, str1.lower(), str2.lower()).ratio()
 
+@lru_cache(maxsize=4096)
+def _similar_ordered(a: str, b: str, threshold: float) -> bool:
+    """Threshold check on pre-lowered, order-normalized strings."""
+    if _rf_fuzz is not None:
+        return _rf_fuzz.ratio(a, b) >= threshold * 100
+    return difflib.SequenceMatcher(None, a, b).ratio() >= threshold
+
 def are_strings_similar(str1: str, str2: str, threshold: float = 0.8) -> bool:
     """
     Check if two strings are similar above a given threshold.
-    
+
     Args:
         str1: First string
         str2: Second string
         threshold: Similarity threshold (0.0 to 1.0)
-        
+
     Returns:
         True if similarity >= threshold
     """
-    return calculate_string_similarity(str1, str2) >= threshold
+    if not str1 or not str2:
+        return False
+    # The ratio can never exceed 2*min(len)/(len1+len2); when that bound is
+    # already under the threshold the match engine can't possibly say yes
+    la, lb = len(str1), len(str2)
+    if 2 * min(la, lb) < threshold * (la + lb):
+        return False
+    # Similarity is symmetric, so sort the pair before caching: (a, b) and
+    # (b, a) land in the same slot, doubling the hit rate
+    a, b = str1.lower(), str2.lower()
+    if a > b:
+        a, b = b, a
+    return _similar_ordered(a, b, threshold)
 
 # ============================================================================
 # Path Utilities
@@ -51,101 +80,140 @@ def are_strings_similar(str1: str, str2: str, threshold: float = 0.8) -> bool:
 
 def get_path_specificity(path: str) -> int:
     """Count path segments for specificity (e.g., 'utils/file.py' -> 2)."""
-    try:
-        return len(Path(path).parts)
-    except Exception:
+    # Paths here are /-normalized, so a C-level count replaces the
+    # PurePath construction that Path(path).parts would pay for
+    if not path:
         return 0
+    return path.count('/') + 1
+
+# Translate table for backslash -> forward-slash conversion
+_BACKSLASH_TABLE = str.maketrans('\\', '/')
 
 def normalize_path_string(path_str: str) -> str:
     """
     Normalize a path string for consistent comparison.
-    
+
     Args:
         path_str: Raw path string
-        
+
     Returns:
         Normalized path string
     """
     if not path_str:
         return ""
-    
+
     # Replace backslashes with forward slashes
-    normalized = path_str.replace('\\', '/')
-    # Remove leading ./ or .\
-    normalized = normalized.lstrip('./')
+    normalized = path_str.translate(_BACKSLASH_TABLE)
+    # Remove a leading ./ (or .\, already translated). The old
+    # lstrip('./') treated its argument as a character set and chewed
+    # through any run of '.' and '/' characters, mangling '../'-relative
+    # and '//'-prefixed inputs
+    if normalized.startswith('./'):
+        normalized = normalized[2:]
     # Remove trailing slashes
-    normalized = normalized.rstrip('/')
-    
-    return normalized
+    return normalized.rstrip('/')
 
 # ============================================================================
 # Markdown Formatting Cleanup
 # ============================================================================
 
+# Bold / italic / inline-code / HTML-tag markers fused into one pattern
+# (branch order mirrors the old sequential subs); the translate table
+# handles whatever unpaired markers remain. Compiled on first use like the
+# comment alternation above.
+_MD_CLEAN_SPEC = r'\*\*(.*?)\*\*|\*(.*?)\*|_(.*?)_|`(.*?)`|<[^>]+>'
+_md_clean_re: Optional[Pattern] = None
+
+def _get_md_clean_re() -> Pattern:
+    global _md_clean_re
+    if _md_clean_re is None:
+        _md_clean_re = re.compile(_MD_CLEAN_SPEC)
+    return _md_clean_re
+
+_STAR_UNDERSCORE_TABLE = str.maketrans('', '', '*_')
+
+def _md_clean_sub(match) -> str:
+    return match.group(1) or match.group(2) or match.group(3) or match.group(4) or ''
+
 def clean_markdown_formatting(text: str) -> str:
     """
     Remove common markdown formatting from text.
-    
+
     Args:
         text: Text with potential markdown formatting
-        
+
     Returns:
         Cleaned text
     """
     if not text:
         return ""
-    
-    # Remove bold formatting: **text**
-    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    # Remove italic formatting: *text* or _text_
-    text = re.sub(r'\*(.*?)\*', r'\1', text)
-    text = re.sub(r'_(.*?)_', r'\1', text)
-    # Remove inline code: `text`
-    text = re.sub(r'`(.*?)`', r'\1', text)
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove any remaining asterisks or underscores
-    text = text.replace('*', '').replace('_', '')
-    
+
+    # One fused pass replaces five sequential re.sub scans; nested markers
+    # (e.g. code inside bold) surface in the replacement, so iterate to a
+    # fixpoint — each extra pass strips marker pairs, so this terminates,
+    # and unnested text needs exactly one pass
+    md_clean_re = _get_md_clean_re()
+    cleaned = md_clean_re.sub(_md_clean_sub, text)
+    while cleaned != text:
+        text = cleaned
+        cleaned = md_clean_re.sub(_md_clean_sub, text)
+    text = cleaned.translate(_STAR_UNDERSCORE_TABLE)
+
     return text.strip()
 
 # ============================================================================
 # Comment/Hint Extraction Utilities
 # ============================================================================
 
-COMMENT_PATTERNS: List[Tuple[Pattern, str]] = [
-    (re.compile(r'^\s*#\s*(.*)$'), '#'),          # Python, shell, etc
-    (re.compile(r'^\s*//\s*(.*)$'), '//'),        # JavaScript, Java, etc  
-    (re.compile(r'^\s*--\s*(.*)$'), '--'),        # SQL, Haskell, etc
-    (re.compile(r'^\s*<!--\s*(.*?)\s*-->$'), '<!--'), # HTML/XML
-    (re.compile(r'^\s*%\s*(.*)$'), '%'),          # LaTeX
-    (re.compile(r'^\s*\*\s*(.*)$'), '*'),         # Some languages
-    (re.compile(r'^\s*REM\s*(.*)$'), 'REM'),      # Batch files
-    (re.compile(r'^\s*"\s*(.*)$'), '"'),          # Vim script
-    (re.compile(r'^\s*;\s*(.*)$'), ';'),          # Lisp, Assembly
-]
+# One alternation covering every comment style, tried in the same order the
+# old per-pattern loop used; a single engine call identifies both the prefix
+# (via lastgroup) and the hint body. Held as source and compiled on first
+# use so importers that never extract hints skip the compile cost.
+_COMBINED_COMMENT_SPEC = (
+    r'^\s*(?:'
+    r'#\s*(?P<hash>.*)'            # Python, shell, etc
+    r'|//\s*(?P<slash>.*)'         # JavaScript, Java, etc
+    r'|--\s*(?P<dash>.*)'          # SQL, Haskell, etc
+    r'|<!--\s*(?P<html>.*?)\s*-->' # HTML/XML
+    r'|%\s*(?P<percent>.*)'        # LaTeX
+    r'|\*\s*(?P<star>.*)'          # Some languages
+    r'|REM\s*(?P<rem>.*)'          # Batch files
+    r'|"\s*(?P<vim>.*)'            # Vim script
+    r'|;\s*(?P<semi>.*)'           # Lisp, Assembly
+    r')$'
+)
+_combined_comment_re: Optional[Pattern] = None
+
+def _get_combined_comment_re() -> Pattern:
+    global _combined_comment_re
+    if _combined_comment_re is None:
+        _combined_comment_re = re.compile(_COMBINED_COMMENT_SPEC)
+    return _combined_comment_re
+
+_COMMENT_PREFIXES = {
+    'hash': '#', 'slash': '//', 'dash': '--', 'html': '<!--',
+    'percent': '%', 'star': '*', 'rem': 'REM', 'vim': '"', 'semi': ';',
+}
 
 def extract_hint_from_line(line: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract hint from a line if it contains a comment.
-    
+
     Args:
         line: Line to analyze
-        
+
     Returns:
         Tuple of (hint, comment_prefix) or (None, None) if no comment
     """
-    line = line.rstrip()
-    
-    for pattern, prefix in COMMENT_PATTERNS:
-        match = pattern.match(line)
-        if match:
-            hint = match.group(1).strip()
-            if hint:
-                # Normalize the hint as a path
-                hint = normalize_path_string(hint)
-                return hint, prefix
-    
+    match = _get_combined_comment_re().match(line.rstrip())
+    if match:
+        group = match.lastgroup
+        hint = (match.group(group) or "").strip()
+        if hint:
+            # Normalize the hint as a path
+            hint = normalize_path_string(hint)
+            return hint, _COMMENT_PREFIXES[group]
+
     return None, None
 
 def extract_hint_and_body(content: str) -> Tuple[str, str, bool]:
@@ -160,36 +228,55 @@ def extract_hint_and_body(content: str) -> Tuple[str, str, bool]:
     """
     if not content:
         return "", "", False
-    
-    lines = content.splitlines()
-    if not lines:
-        return "", content, False
-    
-    first_line = lines[0]
+
+    # partition stops at the first newline instead of splitting every line
+    first_line, sep, rest = content.partition('\n')
     hint, comment_prefix = extract_hint_from_line(first_line)
-    
+
     if hint is not None and comment_prefix is not None:
-        body = "\n".join(lines[1:]).rstrip() if len(lines) > 1 else ""
-        return hint, body, True
-    
+        return hint, rest.rstrip() if sep else "", True
+
     return "", content, False
 
+@lru_cache(maxsize=4096)
+def _path_suffix_and_name(file_path: str) -> Tuple[str, str]:
+    """
+    Cached (extension-without-dot, basename) for a /-normalized path string.
+    Mirrors Path(...).suffix / .name via rfind slicing instead of building
+    a PurePath per call; fence processing asks about the same handful of
+    tree files repeatedly, so repeats become a dict probe.
+    """
+    name = file_path[file_path.rfind('/') + 1:]
+    dot = name.rfind('.')
+    ext = name[dot + 1:] if 0 < dot < len(name) - 1 else ''
+    return ext, name
+
+@lru_cache(maxsize=256)
+def _comment_prefix_for_path(file_path: str) -> str:
+    """
+    Cached comment prefix for a path. The prefix is a pure function of the
+    extension (falling back to the lowered basename for extensionless files
+    like Makefile), so each distinct path resolves it once per process.
+    """
+    ext, name = _path_suffix_and_name(file_path)
+    return get_comment_prefix(ext or name.lower())
+
 def format_hint_comment(file_path: str, file_extension: str = "") -> str:
     """
     Format a file path as a comment hint.
-    
+
     Args:
         file_path: Target file path
         file_extension: File extension for comment style
-        
+
     Returns:
         Formatted comment string
     """
     try:
-        if not file_extension:
-            file_extension = Path(file_path).suffix.lstrip('.') or Path(file_path).name.lower()
-        
-        comment_prefix = get_comment_prefix(file_extension)
+        if file_extension:
+            comment_prefix = get_comment_prefix(file_extension)
+        else:
+            comment_prefix = _comment_prefix_for_path(file_path)
         return f"{comment_prefix}{file_path}"
     except Exception as e:
         logging.warning(f"⚠️ Failed to get comment prefix for '{file_path}': {e}")
@@ -203,44 +290,44 @@ def process_code_block_content(
     content: str,
     target_file: str,
     strip_hints: bool,
-    has_existing_hint: bool
+    has_existing_hint: bool,
+    hint: Optional[str] = None
 ) -> Tuple[str, bool, Optional[str]]:
     """
     Process code block content for hint handling.
-    
+
     Args:
         content: Original code block content
         target_file: Target file path
         strip_hints: Whether to strip hints
         has_existing_hint: Whether content already has a hint
-        
+        hint: Hint already extracted by the caller, to skip re-parsing
+
     Returns:
         Tuple of (processed_content, was_modified, original_hint)
     """
-    lines = content.splitlines()
+    first_line, _, rest = content.partition('\n')
     original_hint = None
-    
-    # Extract existing hint if present
-    if has_existing_hint and lines:
-        hint, _ = extract_hint_from_line(lines[0])
+
+    # Use the caller's extraction when supplied; re-parse only when absent
+    if has_existing_hint and content:
+        if hint is None:
+            hint, _ = extract_hint_from_line(first_line)
         original_hint = hint
-    
+
     # Case 1: Strip hints if requested and exists
     if strip_hints and has_existing_hint:
-        body = "\n".join(lines[1:]).rstrip() if len(lines) > 1 else ""
-        return body, True, original_hint
-    
+        return rest.rstrip(), True, original_hint
+
     # Case 2: Replace existing hint with target file
     if has_existing_hint:
-        body = "\n".join(lines[1:]).rstrip() if len(lines) > 1 else ""
-        file_extension = Path(target_file).suffix.lstrip('.')
-        hint_comment = format_hint_comment(target_file, file_extension)
+        body = rest.rstrip()
+        hint_comment = format_hint_comment(target_file)
         return f"{hint_comment}\n{body}", True, original_hint
     
     # Case 3: Add hint if not stripping
     if not strip_hints:
-        file_extension = Path(target_file).suffix.lstrip('.')
-        hint_comment = format_hint_comment(target_file, file_extension)
+        hint_comment = format_hint_comment(target_file)
         return f"{hint_comment}\n{content}", True, None
     
     # Case 4: No changes needed
@@ -253,34 +340,44 @@ def process_code_block_content(
 class PathLookup:
     """Helper class for efficient path lookups."""
     
-    def __init__(self, file_paths: List[str]):
+    def __init__(self, file_paths: List[str], basenames: Optional[List[str]] = None):
         self.file_paths = file_paths
         self.basename_map: Dict[str, List[str]] = {}
         self.path_parts_map: Dict[str, List[str]] = {}
-        self._build_lookups()
-    
-    def _build_lookups(self):
-        """Build lookup dictionaries."""
-        for file_path in self.file_paths:
-            try:
-                # Basename lookup
-                basename = Path(file_path).name
-                self.basename_map.setdefault(basename, []).append(file_path)
-                
-                # Path parts lookup for partial matching
-                path_parts = Path(file_path).parts
-                for i in range(1, len(path_parts) + 1):
-                    partial_path = str(Path(*path_parts[-i:]))
-                    self.path_parts_map.setdefault(partial_path, []).append(file_path)
-            except Exception as e:
-                logging.warning(f"⚠️ Failed to process path {file_path}: {e}")
+        # Lowered once here so fuzzy queries never re-lower the whole tree
+        self._lowered_paths: List[str] = [p.lower() for p in file_paths]
+        # Hash-set view of the tree for O(1) exact-path membership tests
+        self._file_path_set: FrozenSet[str] = frozenset(file_paths)
+        self._build_lookups(basenames)
+
+    def _build_lookups(self, basenames: Optional[List[str]] = None):
+        """
+        Build lookup dictionaries. When the caller already derived the
+        basenames (map_headings_to_files does, for is_probably_file), they
+        are reused instead of being re-split here.
+        """
+        if basenames is None:
+            # rsplit mirrors Path(...).name on these /-normalized strings,
+            # and since plain string ops cannot raise the per-path
+            # exception guard is gone too
+            basenames = [p.rsplit('/', 1)[-1] for p in self.file_paths]
+
+        for file_path, basename in zip(self.file_paths, basenames):
+            self.basename_map.setdefault(basename, []).append(file_path)
+
+            # Suffix lookup for partial matching: every suffix starting
+            # at a segment boundary, generated by slicing at each '/'
+            # instead of reassembling a PurePath per suffix
+            self.path_parts_map.setdefault(file_path, []).append(file_path)
+            idx = file_path.find('/')
+            while idx != -1:
+                self.path_parts_map.setdefault(file_path[idx + 1:], []).append(file_path)
+                idx = file_path.find('/', idx + 1)
     
     def find_by_exact_path(self, path: str) -> Optional[str]:
         """Find file by exact path match."""
         normalized_path = normalize_path_string(path)
-        if normalized_path in self.file_paths:
-            return normalized_path
-        return None
+        return normalized_path if normalized_path in self._file_path_set else None
     
     def find_by_basename(self, basename: str) -> List[str]:
         """Find files by basename."""
@@ -293,18 +390,56 @@ class PathLookup:
     
     def find_by_fuzzy_match(self, query: str, threshold: float = 0.8, limit: int = 3) -> List[str]:
         """Find files by fuzzy matching."""
-        matches = []
         query_lower = query.lower()
-        
-        for file_path in self.file_paths:
-            similarity = calculate_string_similarity(query_lower, file_path.lower())
+
+        if _rf_process is not None:
+            results = _rf_process.extract(
+                query_lower, self._lowered_paths,
+                scorer=_rf_fuzz.ratio,
+                score_cutoff=threshold * 100, limit=limit
+            )
+            # Map winners back to the originals via the returned index
+            return [self.file_paths[idx] for _, _, idx in results]
+
+        matches = []
+        for file_path, lowered in zip(self.file_paths, self._lowered_paths):
+            similarity = calculate_string_similarity(query_lower, lowered)
             if similarity >= threshold:
                 matches.append((file_path, similarity))
-        
+
         # Sort by similarity score (highest first)
         matches.sort(key=lambda x: x[1], reverse=True)
         return [path for path, _ in matches[:limit]]
 
+    def find_best_matches(self, queries: List[str], threshold: float = 0.8, limit: int = 3) -> Dict[str, List[str]]:
+        """
+        Batch fuzzy-match many queries against the tree at once. With
+        rapidfuzz present the whole queries x paths score matrix comes from
+        one native process.cdist call; otherwise each query falls back to
+        the per-query scan.
+        """
+        if not queries or not self.file_paths:
+            return {query: [] for query in queries}
+
+        if _rf_process is not None:
+            cutoff = threshold * 100
+            try:
+                matrix = _rf_process.cdist(
+                    [query.lower() for query in queries], self._lowered_paths,
+                    scorer=_rf_fuzz.ratio, score_cutoff=cutoff, workers=-1
+                )
+            except ImportError:  # cdist needs numpy
+                matrix = None
+            if matrix is not None:
+                results: Dict[str, List[str]] = {}
+                for query, row in zip(queries, matrix):
+                    scored = [(score, idx) for idx, score in enumerate(row) if score >= cutoff]
+                    scored.sort(key=lambda pair: pair[0], reverse=True)
+                    results[query] = [self.file_paths[idx] for _, idx in scored[:limit]]
+                return results
+
+        return {query: self.find_by_fuzzy_match(query, threshold, limit) for query in queries}
+
 # ============================================================================
 # Heading Mapping Logic
 # ============================================================================
@@ -317,18 +452,38 @@ class HeadingMapper:
         self.heading_to_file: Dict[str, str] = {}
         self.file_to_heading: Dict[str, str] = {}
     
+    def needs_fuzzy_match(self, heading_clean: str) -> bool:
+        """
+        True when no indexed strategy (exact, partial, unique basename) can
+        resolve this heading, i.e. mapping it will fall through to fuzzy
+        matching. Used to pre-collect headings for batch resolution.
+        """
+        if self.path_lookup.find_by_exact_path(heading_clean):
+            return False
+        if self.path_lookup.find_by_partial_path(heading_clean):
+            return False
+        try:
+            basename = Path(heading_clean).name
+            if len(self.path_lookup.find_by_basename(basename)) == 1:
+                return False
+        except Exception:
+            pass
+        return True
+
     def map_heading_to_file(
-        self, 
-        heading_text: str, 
-        heading_clean: str
+        self,
+        heading_text: str,
+        heading_clean: str,
+        fuzzy_cache: Optional[Dict[str, List[str]]] = None
     ) -> Tuple[Optional[str], Optional[str], List[str]]:
         """
         Map a heading to a file using multiple strategies.
-        
+
         Args:
             heading_text: Original heading text with formatting
             heading_clean: Cleaned heading text without markdown
-            
+            fuzzy_cache: Optional precomputed batch fuzzy-match results
+
         Returns:
             Tuple of (mapped_file, original_heading, warnings)
         """
@@ -361,8 +516,12 @@ class HeadingMapper:
         except Exception as e:
             logging.debug(f"⚠️ Error in basename matching for '{heading_clean}': {e}")
         
-        # Strategy 4: Fuzzy matching
-        fuzzy_matches = self.path_lookup.find_by_fuzzy_match(heading_clean, threshold=0.8, limit=1)
+        # Strategy 4: Fuzzy matching (served from the batch cache when the
+        # caller precomputed it)
+        if fuzzy_cache is not None and heading_clean in fuzzy_cache:
+            fuzzy_matches = fuzzy_cache[heading_clean][:1]
+        else:
+            fuzzy_matches = self.path_lookup.find_by_fuzzy_match(heading_clean, threshold=0.8, limit=1)
         if fuzzy_matches:
             self._register_mapping(fuzzy_matches[0], heading_text)
             warnings.append(f"ℹ️ Fuzzy matched heading '{heading_text}' to file '{fuzzy_matches[0]}'")
@@ -404,6 +563,22 @@ class FenceBlockProcessor:
         self.strip_hints = strip_hints
         self.warnings: List[str] = []
         self.unassigned_blocks: List[str] = []
+        # code_map keys never change after construction (only the per-file
+        # lists grow), so snapshot them once instead of per fence block
+        self._code_map_keys: List[str] = list(code_map.keys())
+        # (hint, has_hint) of the last block appended per file, so duplicate
+        # detection reads a dict entry instead of re-splitting the block
+        self._last_hint: Dict[str, Tuple[str, bool]] = {}
+        # Informational (ℹ️) messages are per-block debugging traces; when
+        # the caller runs with info logging disabled (--quiet) skip the
+        # f-string build and list append entirely
+        self._info_enabled = logging.getLogger().isEnabledFor(logging.INFO)
+
+    def note_appended(self, target_file: str, content: str) -> None:
+        """Record the first-line hint of a block just appended to a file."""
+        hint, prefix = extract_hint_from_line(content.partition('\n')[0])
+        found = hint is not None and prefix is not None
+        self._last_hint[target_file] = (hint if found else "", found)
         
     def process_fence_block(
         self,
@@ -422,38 +597,41 @@ class FenceBlockProcessor:
         Returns:
             True if successfully assigned
         """
+        # Extract the hint once per fence; every downstream path reuses it
+        hint, _, has_hint = extract_hint_and_body(fence_content)
+
         # Try current file first
         if current_file and current_file in self.code_map:
-            return self._assign_to_file(current_file, fence_content, "current")
-        
+            return self._assign_to_file(current_file, fence_content, "current", hint, has_hint)
+
         # Try fence info inference
         if fence_info:
-            return self._process_with_fence_info(fence_info, fence_content)
-        
+            return self._process_with_fence_info(fence_info, fence_content, hint, has_hint)
+
         # Try hint in content
-        hint, _, has_hint = extract_hint_and_body(fence_content)
         if hint:
-            return self._process_with_hint(hint, fence_content)
-        
+            return self._process_with_hint(hint, fence_content, has_hint)
+
         # Fallback to unassigned
         self.unassigned_blocks.append(fence_content)
         self.warnings.append(f"⚠️ Could not assign fence block (no info/hint)")
         return False
-    
-    def _process_with_fence_info(self, fence_info: str, fence_content: str) -> bool:
+
+    def _process_with_fence_info(self, fence_info: str, fence_content: str, hint: str, has_hint: bool) -> bool:
         """Process fence block using fence info for inference."""
         try:
-            candidates = infer_targets_from_fence_info(fence_info, list(self.code_map.keys()))
-            
-            # Try exact basename match first
-            fence_basename = Path(fence_info).name
+            candidates = infer_targets_from_fence_info(fence_info, self._code_map_keys)
+
+            # Try exact basename match first; rsplit mirrors Path(...).name
+            # without constructing a PurePath per fence
+            fence_basename = fence_info.rsplit('/', 1)[-1]
             basename_matches = self.path_lookup.find_by_basename(fence_basename)
             if len(basename_matches) == 1:
-                return self._assign_to_file(basename_matches[0], fence_content, "exact_basename")
-            
+                return self._assign_to_file(basename_matches[0], fence_content, "exact_basename", hint, has_hint)
+
             # Single candidate match
             if len(candidates) == 1:
-                return self._assign_to_file(candidates[0], fence_content, "inferred")
+                return self._assign_to_file(candidates[0], fence_content, "inferred", hint, has_hint)
             
             # Multiple candidates
             if len(candidates) > 1:
@@ -468,17 +646,17 @@ class FenceBlockProcessor:
         
         return False
     
-    def _process_with_hint(self, hint: str, fence_content: str) -> bool:
+    def _process_with_hint(self, hint: str, fence_content: str, has_hint: bool) -> bool:
         """Process fence block using hint in content."""
         # Try direct path match
         exact_match = self.path_lookup.find_by_exact_path(hint)
         if exact_match:
-            return self._assign_to_file(exact_match, fence_content, "hint_exact")
-        
+            return self._assign_to_file(exact_match, fence_content, "hint_exact", hint, has_hint)
+
         # Try partial matches
         partial_matches = self.path_lookup.find_by_partial_path(hint)
         if len(partial_matches) == 1:
-            return self._assign_to_file(partial_matches[0], fence_content, "hint_partial")
+            return self._assign_to_file(partial_matches[0], fence_content, "hint_partial", hint, has_hint)
         elif len(partial_matches) > 1:
             self.warnings.append(f"⚠️ Ambiguous hint '{hint}' matches {partial_matches}")
             self.unassigned_blocks.append(fence_content)
@@ -487,54 +665,59 @@ class FenceBlockProcessor:
         return False
     
     def _assign_to_file(
-        self, 
-        target_file: str, 
-        content: str, 
-        match_type: str
+        self,
+        target_file: str,
+        content: str,
+        match_type: str,
+        hint: str,
+        has_hint: bool
     ) -> bool:
         """
         Assign content to a specific file.
-        
+
         Args:
             target_file: Target file path
             content: Code block content
             match_type: Type of match for logging
-            
+            hint: Hint already extracted from content by the caller
+            has_hint: Whether content carries a first-line hint
+
         Returns:
             True if successfully assigned
         """
         if target_file not in self.code_map:
             return False
-        
-        hint, _, has_hint = extract_hint_and_body(content)
+
         processed_content, was_modified, original_hint = process_code_block_content(
-            content, target_file, self.strip_hints, has_hint
+            content, target_file, self.strip_hints, has_hint, hint or None
         )
         
-        if was_modified:
+        if was_modified and self._info_enabled:
             if self.strip_hints and original_hint:
                 self.warnings.append(f"ℹ️ Stripped hint '{original_hint}' from code block")
             elif original_hint:
                 self.warnings.append(f"ℹ️ Replaced hint '{original_hint}' with '{target_file}'")
         
-        # Check for duplicate hints
+        # Check for duplicate hints against the cached last-block hint.
+        # Duplicates are almost always byte-identical, so the == probe
+        # short-circuits the fuzzy ratio for the common case
         if self.code_map[target_file]:
-            last_block = self.code_map[target_file][-1]
-            last_hint, _, last_has_hint = extract_hint_and_body(last_block)
-            if (last_has_hint and has_hint and 
-                are_strings_similar(last_hint, hint) and 
-                not self.strip_hints):
+            last_hint, last_has_hint = self._last_hint.get(target_file, ("", False))
+            if (last_has_hint and has_hint and not self.strip_hints and
+                    (last_hint == hint or are_strings_similar(last_hint, hint))):
                 self.warnings.append(f"⚠️ File {target_file} had multiple code blocks with similar hints")
-        
+
         # Add to code map
         self.code_map[target_file].append(processed_content)
+        self.note_appended(target_file, processed_content)
         
         # Log assignment
-        log_message = f"ℹ️ Assigned fence block ({match_type}) -> {target_file}"
-        if original_hint and not self.strip_hints:
-            log_message += f" (was: '{original_hint}')"
-        self.warnings.append(log_message)
-        
+        if self._info_enabled:
+            log_message = f"ℹ️ Assigned fence block ({match_type}) -> {target_file}"
+            if original_hint and not self.strip_hints:
+                log_message += f" (was: '{original_hint}')"
+            self.warnings.append(log_message)
+
         return True
 
 # ============================================================================
@@ -571,91 +754,115 @@ def map_headings_to_files(
     if not tokens or not tree_files:
         return {}, [], [], {}
     
-    # Initialize code map with valid files
+    # Initialize code map with valid files; basenames are derived once via
+    # the cached helper and reused below so each tree path is parsed a
+    # single time instead of once per consumer
     code_map: Dict[str, List[str]] = {}
+    code_map_basenames: List[str] = []
     for file_path in tree_files:
         try:
-            if is_probably_file(Path(file_path).name, files_always, dirs_always):
+            basename = _path_suffix_and_name(file_path)[1]
+            if is_probably_file(basename, files_always, dirs_always):
                 code_map[file_path] = []
+                code_map_basenames.append(basename)
         except Exception as e:
             logging.warning(f"⚠️ Failed to process tree file {file_path}: {e}")
-    
+
     # Initialize helper objects
-    path_lookup = PathLookup(list(code_map.keys()))
+    path_lookup = PathLookup(list(code_map.keys()), code_map_basenames)
     heading_mapper = HeadingMapper(path_lookup)
     fence_processor = FenceBlockProcessor(code_map, path_lookup, heading_mapper, strip_hints)
     
+    # Pre-pass: collect the headings that will fall through to fuzzy
+    # matching and resolve them all in one batch call, so the token walk
+    # below never scores headings one at a time
+    pending_fuzzy: List[str] = []
+    for tok, nxt in zip(tokens, tokens[1:]):
+        if tok.type == "heading_open" and nxt.type == "inline":
+            heading_clean = clean_markdown_formatting(normalize_path_string(nxt.content.strip()))
+            if (heading_clean and heading_clean.lower() != "file structure"
+                    and heading_mapper.needs_fuzzy_match(heading_clean)):
+                pending_fuzzy.append(heading_clean)
+    fuzzy_cache = path_lookup.find_best_matches(pending_fuzzy, threshold=0.8, limit=1) if pending_fuzzy else {}
+
     # State tracking
     current_file: Optional[str] = None
     current_heading: Optional[str] = None
     skip_next_fence_for_file_structure = False
-    
-    # Process tokens
-    i = 0
-    n = len(tokens)
-    
-    while i < n:
+
+    # Process tokens through the iterator protocol: a C-level advance per
+    # token instead of index arithmetic and bounds-checked subscripts.
+    # Dispatch on token type with a match statement, and hoist the
+    # exception guard out of the loop body: the outer while resumes the
+    # shared iterator after a bad token, so per-token try/except setup is
+    # gone while skip-and-continue recovery is preserved.
+    it = iter(tokens)
+    tok = None
+    while True:
         try:
-            tok = tokens[i]
-            
-            # Handle headings
-            if tok.type == "heading_open":
-                inline = tokens[i + 1] if (i + 1) < n else None
-                heading_text = inline.content.strip() if inline and inline.type == "inline" else ""
-                heading_clean = normalize_path_string(heading_text)
-                heading_clean = clean_markdown_formatting(heading_clean)
-                
-                if heading_clean.lower() == "file structure":
-                    current_file = None
-                    current_heading = None
-                    skip_next_fence_for_file_structure = True
-                else:
-                    current_file, current_heading, heading_warnings = heading_mapper.map_heading_to_file(
-                        heading_text, heading_clean
-                    )
-                    fence_processor.warnings.extend(heading_warnings)
-                
-                i += 1
-                continue
-            
-            # Handle fence blocks
-            if tok.type == "fence":
-                fence_info = getattr(tok, "info", "") or ""
-                fence_info = fence_info.strip()
-                fence_content = textwrap.dedent(tok.content).rstrip()
-                # Unescape backticks to restore original content
-                fence_content = fence_content.replace(r"\\```", r"```")
-                
-                if skip_next_fence_for_file_structure:
-                    skip_next_fence_for_file_structure = False
-                    i += 1
-                    continue
-                
-                fence_processor.process_fence_block(fence_info, fence_content, current_file)
-                i += 1
-                continue
-            
-            # Handle paragraphs under headings as potential content
-            if tok.type == "paragraph_open" and current_file and current_file in code_map:
-                inline = tokens[i + 1] if (i + 1) < n else None
-                para_text = inline.content.strip() if inline and inline.type == "inline" else ""
-                if para_text:
-                    # Avoid adding duplicate content
-                    if not code_map[current_file] or code_map[current_file][-1] != para_text:
-                        code_map[current_file].append(para_text)
-                
-                # Skip to paragraph close
-                j = i + 1
-                while j < n and tokens[j].type != "paragraph_close":
-                    j += 1
-                i = j + 1
-                continue
-            
-            i += 1
-            
+            for tok in it:
+                match tok.type:
+                    # Handle headings
+                    case "heading_open":
+                        inline = next(it, None)  # consume the inline content token
+                        heading_text = inline.content.strip() if inline is not None and inline.type == "inline" else ""
+                        heading_clean = normalize_path_string(heading_text)
+                        heading_clean = clean_markdown_formatting(heading_clean)
+
+                        if heading_clean.lower() == "file structure":
+                            current_file = None
+                            current_heading = None
+                            skip_next_fence_for_file_structure = True
+                        else:
+                            current_file, current_heading, heading_warnings = heading_mapper.map_heading_to_file(
+                                heading_text, heading_clean, fuzzy_cache
+                            )
+                            fence_processor.warnings.extend(heading_warnings)
+
+                    # Handle fence blocks
+                    case "fence":
+                        fence_info = (tok.info or "").strip()
+                        # markdown-it fence bodies rarely carry common
+                        # indentation; only pay the dedent scan when some
+                        # line starts with whitespace, otherwise dedent is
+                        # an identity transform
+                        content = tok.content
+                        if content and (content[0] in ' \t' or '\n ' in content or '\n\t' in content):
+                            fence_content = _dedent(content).rstrip()
+                        else:
+                            fence_content = content.rstrip()
+                        # Unescape backticks to restore original content;
+                        # the old needle (raw "\\```") never matched the
+                        # "\`\`\`" escape the generator emits, and the
+                        # substring gate skips the scan for backslash-free
+                        # bodies
+                        if '\\' in fence_content:
+                            fence_content = fence_content.replace("\\`\\`\\`", "```")
+
+                        if skip_next_fence_for_file_structure:
+                            skip_next_fence_for_file_structure = False
+                        else:
+                            fence_processor.process_fence_block(fence_info, fence_content, current_file)
+
+                    # Handle paragraphs under headings as potential content
+                    case "paragraph_open" if current_file and current_file in code_map:
+                        inline = next(it, None)
+                        para_text = inline.content.strip() if inline is not None and inline.type == "inline" else ""
+                        if para_text:
+                            # Avoid adding duplicate content
+                            if not code_map[current_file] or code_map[current_file][-1] != para_text:
+                                code_map[current_file].append(para_text)
+                                fence_processor.note_appended(current_file, para_text)
+
+                        # Skip to paragraph close
+                        if inline is not None and inline.type != "paragraph_close":
+                            for skipped in it:
+                                if skipped.type == "paragraph_close":
+                                    break
+            break
         except Exception as e:
-            logging.warning(f"⚠️ Error processing token at index {i}: {e}")
-            i += 1
+            tok_type = getattr(tok, "type", "?")
+            logging.warning(f"⚠️ Error processing token {tok_type}: {e}")
     
     logging.info(f"✅ Mapping complete: {len(code_map)} files, {len(fence_processor.unassigned_blocks)} unassigned blocks")
     
@@ -763,97 +970,226 @@ def batch_process_markdown_files(
     Returns:
         Dictionary mapping markdown files to their processing results
     """
-    results = {}
-    
-    for md_file in markdown_files:
+    # Files are independent of each other, so with more than one of them the
+    # work fans out across a process pool; a single file (or an unpicklable
+    # tree_files_provider) takes the sequential path
+    if len(markdown_files) > 1:
         try:
-            # Parse markdown and get tokens
-            # (You'll need to implement this based on your markdown parser)
-            tokens: List[Token] = []  # Placeholder - implement based on your parser
-            
-            # Get tree files for this markdown
-            tree_files = tree_files_provider(md_file)
-            
-            # Process mapping
-            code_map, unassigned, warnings, heading_map = map_headings_to_files(
-                tokens, tree_files, files_always, dirs_always, strip_hints
-            )
-            
-            results[md_file] = {
-                "code_map": code_map,
-                "unassigned": unassigned,
-                "warnings": warnings,
-                "heading_map": heading_map,
-                "success": True
-            }
-            
+            with ProcessPoolExecutor() as executor:
+                futures = [
+                    executor.submit(
+                        _process_one_markdown_file,
+                        md_file, tree_files_provider, files_always, dirs_always, strip_hints
+                    )
+                    for md_file in markdown_files
+                ]
+                return {md_file: result for md_file, result in (f.result() for f in futures)}
         except Exception as e:
-            logging.error(f"❌ Failed to process {md_file}: {e}")
-            results[md_file] = {
-                "success": False,
-                "error": str(e)
-            }
-    
+            logging.warning(f"⚠️ Parallel batch processing failed ({e}); falling back to sequential")
+
+    results = {}
+    for md_file in markdown_files:
+        _, result = _process_one_markdown_file(
+            md_file, tree_files_provider, files_always, dirs_always, strip_hints
+        )
+        results[md_file] = result
     return results
 
+def _process_one_markdown_file(
+    md_file: Path,
+    tree_files_provider,
+    files_always: Set[str],
+    dirs_always: Set[str],
+    strip_hints: bool
+) -> Tuple[Path, Dict[str, Any]]:
+    """
+    Process a single markdown file for batch_process_markdown_files. Kept at
+    module level so ProcessPoolExecutor can pickle it for worker processes.
+    """
+    try:
+        # Parse markdown and get tokens
+        # (You'll need to implement this based on your markdown parser)
+        tokens: List[Token] = []  # Placeholder - implement based on your parser
+
+        # Get tree files for this markdown
+        tree_files = tree_files_provider(md_file)
+
+        # Process mapping
+        code_map, unassigned, warnings, heading_map = map_headings_to_files(
+            tokens, tree_files, files_always, dirs_always, strip_hints
+        )
+
+        return md_file, {
+            "code_map": code_map,
+            "unassigned": unassigned,
+            "warnings": warnings,
+            "heading_map": heading_map,
+            "success": True
+        }
+
+    except Exception as e:
+        logging.error(f"❌ Failed to process {md_file}: {e}")
+        return md_file, {
+            "success": False,
+            "error": str(e)
+        }
+
 # ============================================================================
 # Helper Functions for External Use
 # ============================================================================
 
+def build_path_lookup(
+    tree_files: List[str],
+    files_always: Set[str],
+    dirs_always: Set[str]
+) -> PathLookup:
+    """
+    Filter tree entries to probable files and index them in a PathLookup.
+    Callers matching many headings against the same tree should build this
+    once and pass it to get_mapped_files_for_heading, instead of paying the
+    filter and index construction per heading.
+    """
+    # No try needed: the suffix helper is pure string slicing and
+    # is_probably_file validates its own inputs instead of raising
+    valid_files = []
+    valid_basenames = []
+    for file_path in tree_files:
+        basename = _path_suffix_and_name(file_path)[1]
+        if is_probably_file(basename, files_always, dirs_always):
+            valid_files.append(file_path)
+            valid_basenames.append(basename)
+    return PathLookup(valid_files, valid_basenames)
+
 def get_mapped_files_for_heading(
     heading_text: str,
     tree_files: List[str],
     files_always: Set[str],
-    dirs_always: Set[str]
+    dirs_always: Set[str],
+    path_lookup: Optional[PathLookup] = None
 ) -> List[str]:
     """
     Get potential file matches for a heading without full processing.
-    
+
     Args:
         heading_text: Heading text to match
         tree_files: Available file paths
         files_always: Set of names to treat as files
         dirs_always: Set of names to treat as directories
-        
+        path_lookup: Prebuilt lookup over the tree (from build_path_lookup);
+            built on the fly when omitted
+
     Returns:
         List of potential file matches
     """
-    # Filter to valid files
-    valid_files = []
-    for file_path in tree_files:
-        try:
-            if is_probably_file(Path(file_path).name, files_always, dirs_always):
-                valid_files.append(file_path)
-        except Exception:
-            continue
-    
+    if path_lookup is None:
+        path_lookup = build_path_lookup(tree_files, files_always, dirs_always)
+
     # Clean and normalize heading
     heading_clean = normalize_path_string(heading_text)
     heading_clean = clean_markdown_formatting(heading_clean)
-    
-    # Create lookup and find matches
-    path_lookup = PathLookup(valid_files)
-    
-    # Try multiple strategies
-    matches = []
-    
+
+    # Try multiple strategies, deduplicating inline with a seen-set
+    # (matches lists are small, so this beats the dict.fromkeys pass
+    # that used to run at the end)
+    matches: List[str] = []
+    seen = set()
+
     # Exact match
     exact_match = path_lookup.find_by_exact_path(heading_clean)
     if exact_match:
         matches.append(exact_match)
-    
+        seen.add(exact_match)
+
     # Partial matches
-    matches.extend(path_lookup.find_by_partial_path(heading_clean))
-    
+    for match in path_lookup.find_by_partial_path(heading_clean):
+        if match not in seen:
+            seen.add(match)
+            matches.append(match)
+
     # Basename match
-    try:
-        basename = Path(heading_clean).name
-        matches.extend(path_lookup.find_by_basename(basename))
-    except Exception:
-        pass
-    
-    # Fuzzy matches
-    matches.extend(path_lookup.find_by_fuzzy_match(heading_clean))
-    
-    # Remove duplicates and return
-    return list(dict.fromkeys(matches))  # Preserve order while deduplicating
\ No newline at end of file
+    for match in path_lookup.find_by_basename(heading_clean.rsplit('/', 1)[-1]):
+        if match not in seen:
+            seen.add(match)
+            matches.append(match)
+
+    # Fuzzy matches — skipped outright on an exact hit, since the exact
+    # path is already the definitive answer and fuzzy scoring is by far
+    # the most expensive strategy
+    if not exact_match:
+        for match in path_lookup.find_by_fuzzy_match(heading_clean):
+            if match not in seen:
+                seen.add(match)
+                matches.append(match)
+
+    return matches
+
+def get_mapped_files_for_all_headings(
+    headings: List[str],
+    tree_files: List[str],
+    files_always: Set[str],
+    dirs_always: Set[str]
+) -> Dict[str, List[str]]:
+    """
+    Match many headings against the tree in one pass.
+
+    The tree is filtered and indexed once, and every heading's fuzzy
+    scoring runs through a single find_best_matches call — one native
+    score matrix instead of a per-heading scan — while the indexed
+    strategies (exact, partial, basename) stay per-heading dictionary
+    probes.
+
+    Args:
+        headings: Heading texts to match
+        tree_files: Available file paths
+        files_always: Set of names to treat as files
+        dirs_always: Set of names to treat as directories
+
+    Returns:
+        Dictionary mapping each heading to its potential file matches
+    """
+    if not headings:
+        return {}
+
+    path_lookup = build_path_lookup(tree_files, files_always, dirs_always)
+
+    cleaned = [
+        clean_markdown_formatting(normalize_path_string(heading))
+        for heading in headings
+    ]
+    # Headings with an exact hit never reach fuzzy scoring (matching the
+    # single-heading helper), so only the rest go into the score matrix
+    exact_matches = {
+        heading_clean: path_lookup.find_by_exact_path(heading_clean)
+        for heading_clean in cleaned
+    }
+    fuzzy_queries = [hc for hc, exact in exact_matches.items() if not exact]
+    fuzzy_results = path_lookup.find_best_matches(fuzzy_queries) if fuzzy_queries else {}
+
+    results: Dict[str, List[str]] = {}
+    for heading, heading_clean in zip(headings, cleaned):
+        matches: List[str] = []
+        seen = set()
+
+        exact_match = exact_matches[heading_clean]
+        if exact_match:
+            matches.append(exact_match)
+            seen.add(exact_match)
+
+        for match in path_lookup.find_by_partial_path(heading_clean):
+            if match not in seen:
+                seen.add(match)
+                matches.append(match)
+
+        for match in path_lookup.find_by_basename(heading_clean.rsplit('/', 1)[-1]):
+            if match not in seen:
+                seen.add(match)
+                matches.append(match)
+
+        for match in fuzzy_results.get(heading_clean, []):
+            if match not in seen:
+                seen.add(match)
+                matches.append(match)
+
+        results[heading] = matches
+
+    return results
\ No newline at end of file
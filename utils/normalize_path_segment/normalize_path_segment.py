@@ -1,19 +1,23 @@
 from pathlib import Path
-import re
 import logging
+from functools import lru_cache
 from typing import Union
 
+# Inputs longer than this bypass the cache so pathological segments cannot
+# pin large strings in memory
+_CACHE_MAX_LEN = 256
+
 def normalize_path_segment(seg: Union[str, Path]) -> str:
     """
     Normalize a path segment by stripping whitespace and trailing slashes.
     Handles various edge cases and provides robust normalization.
-    
+
     Args:
         seg: Path segment to normalize (string or Path object)
-        
+
     Returns:
         Normalized path segment as string
-        
+
     Examples:
         >>> normalize_path_segment("  src/  ")
         'src'
@@ -27,11 +31,11 @@ def normalize_path_segment(seg: Union[str, Path]) -> str:
     # Handle None input
     if seg is None:
         return ""
-    
+
     # Convert Path objects to string
     if isinstance(seg, Path):
         seg = str(seg)
-    
+
     # Ensure it's a string
     if not isinstance(seg, str):
         try:
@@ -39,19 +43,46 @@ def normalize_path_segment(seg: Union[str, Path]) -> str:
         except Exception as e:
             logging.debug(f"⚠️ Failed to convert path segment to string: {e}")
             return ""
-    
+
+    # Tree entries repeat heavily (shared parent prefixes, sibling
+    # basenames), so the pure string->string normalization is memoized;
+    # only unusually long inputs pay the scan every time
+    if len(seg) <= _CACHE_MAX_LEN:
+        return _normalize_impl(seg)
+    return _normalize_impl.__wrapped__(seg)
+
+@lru_cache(maxsize=4096)
+def _normalize_impl(seg: str) -> str:
+    """Normalize an already-coerced string segment (cached)."""
     # Strip whitespace and normalize
     normalized = seg.strip()
-    
-    # Remove trailing slashes (both forward and backward)
-    normalized = re.sub(r'[/\\]+$', '', normalized)
-    
+
+    # Remove trailing slashes (both forward and backward); rstrip over the
+    # two-char set matches the old [/\\]+$ regex exactly
+    normalized = normalized.rstrip('/\\')
+
     # Remove leading ./ or .\
-    normalized = re.sub(r'^\.[/\\]', '', normalized)
-    
-    # Collapse multiple slashes into single forward slash
-    normalized = re.sub(r'[/\\]+', '/', normalized)
-    
+    if normalized[:2] in ('./', '.\\'):
+        normalized = normalized[2:]
+
+    # Collapse runs of slashes into single forward slashes. Segments with
+    # no backslashes and no doubled slash are already in canonical form,
+    # so the common case skips the rebuild; otherwise one scan emits the
+    # result instead of a regex substitution pass
+    if '\\' in normalized or '//' in normalized:
+        out = []
+        add = out.append
+        prev_slash = False
+        for c in normalized:
+            if c == '/' or c == '\\':
+                if not prev_slash:
+                    add('/')
+                    prev_slash = True
+            else:
+                add(c)
+                prev_slash = False
+        normalized = ''.join(out)
+
     return normalized.strip()
 
 def normalize_path_segments(segments: list) -> list:
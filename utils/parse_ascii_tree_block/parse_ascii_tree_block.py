@@ -1,6 +1,8 @@
 from typing import List, Tuple, Set, Optional
 import re
 import logging
+from bisect import bisect_left
+from functools import lru_cache
 from pathlib import Path
 
 from utils.is_probably_file.is_probably_file import is_probably_file
@@ -11,53 +13,52 @@ INDENT_PATTERN = re.compile(r"^[\s│├└─]+")
 COMMENT_PATTERN = re.compile(r"\s*(#|//|--)\s+.*$")
 TRAILING_SLASH_PATTERN = re.compile(r"/+$")
 
+# Tree drawing characters all map to spaces; one translate pass replaces
+# the chain of str.replace calls (each of which rescanned and reallocated
+# the whole line). '──' needs no special case since each '─' becomes ' '.
+_TREE_CHAR_TABLE = str.maketrans({'│': ' ', '├': ' ', '└': ' ', '─': ' '})
+
 def clean_tree_line(raw_line: str) -> Optional[str]:
     """
     Clean and normalize a single line from ASCII tree.
     """
     if not raw_line or not raw_line.strip():
         return None
-    
+
     line = raw_line.rstrip()  # Only strip trailing whitespace
-    
+
     # Skip comment lines
     if line.strip().startswith('#'):
         return None
-    
+
     # Replace tree characters with spaces but maintain structure
-    cleaned = line
-    for char in ['│', '├', '└']:
-        cleaned = cleaned.replace(char, ' ')
-    
-    cleaned = cleaned.replace('──', '  ')
-    cleaned = cleaned.replace('─', ' ')
-    
-    content = cleaned.strip()
-    
+    content = line.translate(_TREE_CHAR_TABLE).strip()
+
     if not content:
         return None
-    
+
     # Remove trailing slash but note it
     has_trailing_slash = content.endswith('/')
     if has_trailing_slash:
         content = content.rstrip('/')
-    
-    # Remove inline comments
+
+    # Remove inline comments; the substring gates keep comment-free lines
+    # (the overwhelming majority) to three C-level scans with no split
     if ' #' in content:
         content = content.split(' #', 1)[0].strip()
     if ' //' in content:
         content = content.split(' //', 1)[0].strip()
     if ' -- ' in content:
         content = content.split(' -- ', 1)[0].strip()
-    
+
     content = content.strip()
     if not content:
         return None
-    
+
     # Add back trailing slash for directory detection
     if has_trailing_slash:
         content += '/'
-    
+
     return content
 
 def calculate_indent_level(line: str) -> int:
@@ -80,23 +81,35 @@ def calculate_indent_level(line: str) -> int:
     return indent_chars
 
 def build_directory_stack(
-    current_indent: int, 
-    stack: List[Tuple[str, int]]
+    current_indent: int,
+    stack: List[Tuple[str, int]],
+    indent_levels: Optional[List[int]] = None
 ) -> List[Tuple[str, int]]:
     """
     Maintain and update the directory stack based on current indent level.
-    
+
     Args:
         current_indent: Current line's indent level
         stack: Current directory stack
-        
+        indent_levels: Parallel list of the stack's indent values (kept
+            sorted by construction); when provided, the truncation point
+            is found with one bisect and both lists are sliced at C level
+            instead of popping in an interpreted loop
+
     Returns:
         Updated directory stack
     """
+    if indent_levels is not None:
+        # Drop every frame with indent >= current_indent
+        new_len = bisect_left(indent_levels, current_indent)
+        del stack[new_len:]
+        del indent_levels[new_len:]
+        return stack
+
     # Pop stack until we find parent with smaller indent
     while stack and current_indent <= stack[-1][1]:
         stack.pop()
-    
+
     return stack
 
 def should_treat_as_directory(
@@ -133,22 +146,20 @@ def normalize_entries_relative_to_root(entries: List[str], files_always: Set[str
         return []
     
     root = entries[0]
-    
+
     # If root is a file, return entries as-is
     if is_probably_file(Path(root).name, files_always, dirs_always):
         return entries
-    
-    normalized = [root]
-    
-    for entry in entries[1:]:
-        if entry.startswith(root + '/'):
-            # Entry is already relative to root
-            normalized.append(entry)
-        else:
-            # Make entry relative to root
-            normalized.append(f"{root}/{entry}")
-    
-    return normalized
+
+    # Hoist the prefix out of the loop; the fixed-length slice compare
+    # replaces per-entry startswith calls and the comprehension replaces
+    # the append loop
+    prefix = root + '/'
+    plen = len(prefix)
+    return [root] + [
+        entry if entry[:plen] == prefix else f"{prefix}{entry}"
+        for entry in entries[1:]
+    ]
 
 def parse_ascii_tree_block(
     block_text: str, 
@@ -165,46 +176,61 @@ def parse_ascii_tree_block(
     
     files_always = files_always or set()
     dirs_always = dirs_always or set()
-    
+
+    # Names repeat heavily across a tree (__init__.py, index.js, ...), so
+    # memoize the file/directory heuristic per name for this invocation;
+    # the closure pins the always-sets, keeping the cache key to one string
+    _is_file = lru_cache(maxsize=1024)(
+        lambda name: is_probably_file(name, files_always, dirs_always)
+    )
+
     try:
         lines = block_text.splitlines()
         entries: List[str] = []
         stack: List[Tuple[str, int]] = [("", 0)]  # (path, indent_level)
-        
-        for line_num, raw_line in enumerate(lines, 1):
+        indent_levels: List[int] = [0]  # parallel, sorted view of the stack
+
+        # Exceptions here are rare, so the guard sits outside the per-line
+        # body: the outer while resumes the shared enumerate iterator after
+        # logging a bad line, preserving skip-and-continue recovery without
+        # per-iteration exception-block setup
+        line_iter = enumerate(lines, 1)
+        line_num, raw_line = 0, ""
+        while True:
             try:
-                # Clean and validate line
-                cleaned_line = clean_tree_line(raw_line)
-                if not cleaned_line:
-                    continue
-                
-                # Calculate indent level
-                indent_level = calculate_indent_level(raw_line)
-                
-                # Update directory stack
-                stack = build_directory_stack(indent_level, stack)
-                
-                # Get parent directory
-                parent_path = stack[-1][0] if stack else ""
-                
-                # Build full path
-                if parent_path:
-                    full_path = f"{parent_path}/{cleaned_line}"
-                else:
-                    full_path = cleaned_line
-                
-                # Normalize path
-                full_path = normalize_path_segment(full_path)
-                
-                entries.append(full_path)
-                
-                # Add to stack if it's a directory
-                if should_treat_as_directory(cleaned_line, files_always, dirs_always):
-                    stack.append((full_path, indent_level))
-                    
+                for line_num, raw_line in line_iter:
+                    # Clean and validate line
+                    cleaned_line = clean_tree_line(raw_line)
+                    if not cleaned_line:
+                        continue
+
+                    # Calculate indent level
+                    indent_level = calculate_indent_level(raw_line)
+
+                    # Update directory stack
+                    stack = build_directory_stack(indent_level, stack, indent_levels)
+
+                    # Get parent directory
+                    parent_path = stack[-1][0] if stack else ""
+
+                    # Build full path
+                    if parent_path:
+                        full_path = f"{parent_path}/{cleaned_line}"
+                    else:
+                        full_path = cleaned_line
+
+                    # Normalize path
+                    full_path = normalize_path_segment(full_path)
+
+                    entries.append(full_path)
+
+                    # Add to stack if it's a directory
+                    if not _is_file(cleaned_line):
+                        stack.append((full_path, indent_level))
+                        indent_levels.append(indent_level)
+                break
             except Exception as e:
                 logging.warning(f"⚠️ Error parsing line {line_num}: '{raw_line}' - {e}")
-                continue
         
         # Normalize entries relative to root
         if entries:
@@ -233,27 +259,26 @@ def validate_parsed_tree(entries: List[str]) -> Tuple[bool, List[str]]:
         warnings.append("No entries parsed from tree")
         return False, warnings
     
-    # Check for duplicates
+    # Duplicate and hierarchy checks in one pass over plain strings.
+    # Since entries are /-normalized, the immediate parent is a rpartition
+    # slice — no Path (or Path.parents tuple) allocation per entry — and
+    # checking only the immediate parent suffices: every ancestor is
+    # itself an entry whose own immediate parent gets checked
+    entries_set = set(entries)
     seen = set()
     duplicates = []
     for entry in entries:
         if entry in seen:
             duplicates.append(entry)
-        seen.add(entry)
-    
+        else:
+            seen.add(entry)
+        parent = entry.rpartition('/')[0]
+        if parent and parent not in entries_set:
+            warnings.append(f"Missing parent directory in tree: {parent} for {entry}")
+
     if duplicates:
         warnings.append(f"Found duplicate entries: {duplicates}")
-    
-    # Check for proper hierarchy
-    entries_set = set(entries)
-    for entry in entries:
-        path = Path(entry)
-        # Check if all parent directories exist in the tree
-        for parent in path.parents:
-            if parent != Path('.') and str(parent) not in entries_set:
-                warnings.append(f"Missing parent directory in tree: {parent} for {entry}")
-                break
-    
+
     is_valid = len(warnings) == 0
     return is_valid, warnings
 
@@ -2,7 +2,12 @@ from pathlib import Path
 from typing import List, Dict, Tuple, Set, Optional, Any
 import logging
 import hashlib
-from fnmatch import fnmatch
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch, translate
+from functools import lru_cache
 
 from utils.safe_write_text.safe_write_text import safe_write_text
 from utils.validate_entry_path.validate_entry_path import validate_entry_path
@@ -10,6 +15,29 @@ from utils.normalize_path_segment.normalize_path_segment import normalize_path_s
 from utils.is_probably_file.is_probably_file import is_probably_file
 from utils.config.config import EXT_COMMENT_PLACEHOLDER, get_comment_prefix
 
+# Cache namespace for per-file modification records; versioned so that
+# entries hashed with the previous algorithm (MD5) are not compared
+# against the current fingerprints
+FILE_MODIFICATIONS_CACHE_KEY = "file_modifications_v2"
+
+# Change-detection fingerprints only need fast, stable equality — not
+# cryptographic strength: prefer SIMD-accelerated blake3 when installed
+# and fall back to hashlib's keyless BLAKE2b at the same 128-bit size
+try:
+    from blake3 import blake3 as _blake3
+
+    def content_fingerprint(content) -> str:
+        """Fingerprint content (str or bytes) for change detection."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return _blake3(content).hexdigest(16)
+except ImportError:
+    def content_fingerprint(content) -> str:
+        """Fingerprint content (str or bytes) for change detection."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
 def get_cache_performance_stats(cache_manager: Optional[Any]) -> Dict[str, Any]:
     """
     Get cache performance statistics if cache manager is available.
@@ -36,20 +64,76 @@ def get_cache_performance_stats(cache_manager: Optional[Any]) -> Dict[str, Any]:
         logging.debug(f"⚠️ Could not get cache performance stats: {e}")
         return {}
 
+@lru_cache(maxsize=64)
+def _merged_ignore_regex(patterns: Tuple[str, ...]):
+    """
+    Union the glob patterns into one compiled alternation ("compile once,
+    match many"), mirroring the merged matcher used on the folder-to-
+    markdown side. Returns None if any pattern fails to translate.
+    """
+    try:
+        return re.compile('|'.join(f'(?:{translate(pat)})' for pat in patterns))
+    except re.error as e:
+        logging.warning(f"⚠️ Failed to merge ignore patterns, falling back to fnmatch: {e}")
+        return None
+
+_EXT_PATTERN = re.compile(r"^\*\.[A-Za-z0-9_]+$")
+
+@lru_cache(maxsize=64)
+def _compile_ignore_spec(patterns: Tuple[str, ...]) -> Tuple:
+    """
+    Partition glob patterns by how cheaply they can be checked:
+    pure *.ext suffixes become a frozenset of extensions, patterns with
+    no glob metacharacters become a literal-path frozenset, and only the
+    rest go through the merged regex. Most real ignore lists are suffix
+    globs, so most checks collapse to one set probe.
+
+    Returns:
+        Tuple of (ext_set, literal_set, regex_or_None, fallback_patterns);
+        fallback_patterns is non-empty only when regex translation failed
+    """
+    ext_parts: List[str] = []
+    literal_parts: List[str] = []
+    glob_parts: List[str] = []
+    for pattern in patterns:
+        if _EXT_PATTERN.match(pattern):
+            ext_parts.append(pattern[2:])
+        elif not any(ch in pattern for ch in '*?['):
+            literal_parts.append(pattern)
+        else:
+            glob_parts.append(pattern)
+
+    regex = _merged_ignore_regex(tuple(glob_parts)) if glob_parts else None
+    fallback: Tuple[str, ...] = ()
+    if glob_parts and regex is None:
+        fallback = tuple(glob_parts)
+    return frozenset(ext_parts), frozenset(literal_parts), regex, fallback
+
+def _matches_ignore_spec(entry: str, spec: Tuple) -> bool:
+    """Check one entry against a spec from _compile_ignore_spec."""
+    ext_set, literal_set, regex, fallback = spec
+    if ext_set and '.' in entry and entry.rsplit('.', 1)[-1] in ext_set:
+        return True
+    if entry in literal_set:
+        return True
+    if regex is not None and regex.match(entry) is not None:
+        return True
+    return any(fnmatch(entry, pat) for pat in fallback)
+
 def should_ignore_entry(entry: str, ignore_patterns: List[str]) -> bool:
     """
     Check if an entry should be ignored based on patterns.
-    
+
     Args:
         entry: Entry path to check
         ignore_patterns: List of glob patterns to ignore
-        
+
     Returns:
         True if entry should be ignored
     """
     if not ignore_patterns:
         return False
-    return any(fnmatch(entry, pat) for pat in ignore_patterns)
+    return _matches_ignore_spec(entry, _compile_ignore_spec(tuple(ignore_patterns)))
 
 def prepare_file_content(
     entry: str,
@@ -69,25 +153,45 @@ def prepare_file_content(
     Returns:
         Tuple of (content, is_placeholder, warning_message)
     """
-    content_parts = code_map.get(entry, [])
-    
+    # Fast path first: most entries have mapped content, so they return
+    # before any placeholder branching
+    content_parts = code_map.get(entry)
     if content_parts:
         content = "\n\n".join(content_parts).strip()
         if content:
-            content += "\n"
-            return content, False, None
-        else:
-            return None, False, f"File '{entry}' has empty content blocks"
-    
+            return content + "\n", False, None
+        return None, False, f"File '{entry}' has empty content blocks"
+
     if skip_empty:
         return None, True, f"ℹ️ Skipped placeholder file {entry} due to --skip-empty"
-    
-    name = Path(entry).name
-    ext = "." + name.split(".")[-1] if "." in name else ""
+
+    # rpartition slices replace the Path allocation and split list; entries
+    # are /-normalized by this point. Interning the extension makes the
+    # probe into the interned-key placeholder table pointer-equal
+    name = entry.rpartition('/')[2]
+    dot = name.rfind('.')
+    ext = sys.intern("." + name[dot + 1:]) if dot != -1 else ""
     content = EXT_COMMENT_PLACEHOLDER.get(ext, EXT_COMMENT_PLACEHOLDER["default"])
-    
+
     return content, True, None
 
+@lru_cache(maxsize=128)
+def _heading_comment_parts(ext: str) -> Optional[Tuple[str, str]]:
+    """
+    Cached (opening, closing) strings wrapping a heading comment for an
+    extension, or None when the extension has no comment style. Resolves
+    the prefix and the block-comment branching once per extension instead
+    of per file.
+    """
+    prefix = get_comment_prefix(ext)
+    if not prefix:
+        return None
+    if prefix == "/* ":
+        return "/* ", " */\n"
+    if prefix == "<!-- ":
+        return "<!-- ", " -->\n"
+    return prefix, "\n"
+
 def add_heading_comment(content: str, entry: str, heading_map: Dict[str, str]) -> str:
     """
     Add heading as a comment to the file content.
@@ -104,20 +208,18 @@ def add_heading_comment(content: str, entry: str, heading_map: Dict[str, str]) -
         return content
     
     heading = heading_map[entry]
-    ext = Path(entry).suffix.lower()
-    prefix = get_comment_prefix(ext)
-    
-    if not prefix:
+    # Entries are /-normalized, so rsplit/rfind mirror Path(...).suffix
+    # without constructing a PurePath per file
+    name = entry.rsplit('/', 1)[-1]
+    dot = name.rfind('.')
+    ext = name[dot:].lower() if 0 < dot < len(name) - 1 else ''
+
+    parts = _heading_comment_parts(ext)
+    if parts is None:
         return content
-    
-    if prefix == "/* ":
-        heading_comment = f"/* {heading} */\n"
-    elif prefix == "<!-- ":
-        heading_comment = f"<!-- {heading} -->\n"
-    else:
-        heading_comment = f"{prefix}{heading}\n"
-    
-    return heading_comment + content
+
+    opening, closing = parts
+    return f"{opening}{heading}{closing}{content}"
 
 def count_content_lines(content: str) -> int:
     """
@@ -131,71 +233,96 @@ def count_content_lines(content: str) -> int:
     """
     if not content:
         return 0
-    return content.count("\n") + (1 if content and not content.endswith("\n") else 0)
+    # content is known non-empty here; bool arithmetic replaces the
+    # compound conditional (writer-produced content always ends with a
+    # newline, making the correction term zero)
+    return content.count("\n") + (not content.endswith("\n"))
 
-def should_update(file_path: Path, content: str, cache: Dict[str, str], cache_manager: Optional[Any] = None) -> bool:
+def should_update(
+    file_path: Path,
+    content: str,
+    cache: Dict[str, str],
+    cache_manager: Optional[Any] = None,
+    content_bytes: Optional[bytes] = None
+) -> bool:
     """
     Check if a file needs updating using enhanced cache system.
-    
+
     Args:
         file_path: Path to the file
         content: Proposed content to write
         cache: Simple cache dictionary
         cache_manager: Advanced cache manager for enhanced operations
-        
+        content_bytes: Pre-encoded content, passed by callers that already
+            encoded it so the hot path never encodes twice
+
     Returns:
         True if the file should be updated
     """
+    if content_bytes is None:
+        content_bytes = content.encode("utf-8")
+
     # Use cache_manager if available for advanced checks
     if cache_manager:
         try:
             # Load file modification cache from manager
-            file_cache = cache_manager.load("file_modifications") or {}
+            file_cache = cache_manager.load(FILE_MODIFICATIONS_CACHE_KEY) or {}
             file_key = str(file_path.relative_to(file_path.parent.parent) if file_path.is_relative_to(Path.cwd()) else file_path)
-            
+
             if file_key in file_cache:
                 cached_data = file_cache[file_key]
-                current_hash = hashlib.md5(content.encode("utf-8")).hexdigest()
-                
-                # Check if file exists and matches cached state
+
+                # Size is checked before anything else: a length mismatch
+                # against the cached write already proves the content
+                # changed, with no stat and no hash
+                if cached_data.get('size') != len(content_bytes):
+                    return True
+
+                # Check if file exists and matches cached state; the hash
+                # only runs once mtime and size both agree
                 if file_path.exists():
                     file_stat = file_path.stat()
-                    if (cached_data.get('hash') == current_hash and 
-                        cached_data.get('modified') == file_stat.st_mtime and
-                        cached_data.get('size') == file_stat.st_size):
+                    if (cached_data.get('modified') == file_stat.st_mtime and
+                        cached_data.get('size') == file_stat.st_size and
+                        cached_data.get('hash') == content_fingerprint(content_bytes)):
                         return False
-                
+
                 return True
         except Exception as e:
             logging.debug(f"⚠️ Cache manager check failed, falling back to simple cache: {e}")
-    
+
     # Fallback to simple cache logic
     if not cache:
         return True
-    
-    content_hash = hashlib.md5(content.encode("utf-8")).hexdigest()
-    cached_hash = cache.get(str(file_path))
-    
-    if cached_hash != content_hash:
-        return True
-    
+
     if not file_path.exists():
         return True
-    
-    return False
 
-def update_cache(file_path: Path, content: str, cache: Dict[str, str], cache_manager: Optional[Any] = None) -> None:
+    # A size mismatch on disk guarantees different content — skip the hash
+    if file_path.stat().st_size != len(content_bytes):
+        return True
+
+    return cache.get(str(file_path)) != content_fingerprint(content_bytes)
+
+def update_cache(
+    file_path: Path,
+    content: str,
+    cache: Dict[str, str],
+    cache_manager: Optional[Any] = None,
+    content_bytes: Optional[bytes] = None
+) -> None:
     """
     Update cache with enhanced capabilities using cache manager.
-    
+
     Args:
         file_path: Path to the file
         content: Content written to the file
         cache: Simple cache dictionary
         cache_manager: Advanced cache manager
+        content_bytes: Pre-encoded content, when the caller already has it
     """
-    content_hash = hashlib.md5(content.encode("utf-8")).hexdigest()
-    
+    content_hash = content_fingerprint(content_bytes if content_bytes is not None else content)
+
     # Update simple cache
     cache[str(file_path)] = content_hash
     
@@ -206,7 +333,7 @@ def update_cache(file_path: Path, content: str, cache: Dict[str, str], cache_man
             file_key = str(file_path.relative_to(file_path.parent.parent) if file_path.is_relative_to(Path.cwd()) else file_path)
             
             # Load existing cache or create new
-            file_cache = cache_manager.load("file_modifications") or {}
+            file_cache = cache_manager.load(FILE_MODIFICATIONS_CACHE_KEY) or {}
             file_cache[file_key] = {
                 'hash': content_hash,
                 'modified': file_stat.st_mtime,
@@ -215,7 +342,7 @@ def update_cache(file_path: Path, content: str, cache: Dict[str, str], cache_man
             }
             
             # Save updated cache
-            cache_manager.save("file_modifications", file_cache)
+            cache_manager.save(FILE_MODIFICATIONS_CACHE_KEY, file_cache)
             
         except Exception as e:
             logging.debug(f"⚠️ Failed to update advanced cache: {e}")
@@ -233,11 +360,12 @@ def process_file_entry(
     dirs_always: Set,
     warnings: List[str],
     cache: Dict[str, str],
-    cache_manager: Optional[Any] = None  # Add cache_manager parameter
+    cache_manager: Optional[Any] = None,  # Add cache_manager parameter
+    pending_writes: Optional[List[Tuple[Path, str]]] = None
 ) -> Tuple[Optional[str], int, int, int]:
     """
     Process a single file entry for writing.
-    
+
     Args:
         entry: File entry path
         out_root: Root output directory
@@ -251,7 +379,12 @@ def process_file_entry(
         dirs_always: Directories always set
         warnings: Warnings list to append to
         cache: Cache for incremental updates
-        
+        cache_manager: Advanced cache manager
+        pending_writes: When given, (path, content) pairs that pass the
+            overwrite/cache checks are queued here instead of written, so
+            the caller can flush them concurrently; the returned
+            files_written_flag is then always 0
+
     Returns:
         Tuple of (file_path, lines_written, placeholder_flag, files_written_flag)
     """
@@ -271,9 +404,10 @@ def process_file_entry(
         return None, 0, int(is_placeholder), 0
     
     content_with_heading = add_heading_comment(content, entry, heading_map)
-    
-    parts = entry.split("/")
-    file_path = out_root.joinpath(*parts)
+
+    # One Path parse of the joined string instead of joinpath re-parsing
+    # every segment (entries are already /-normalized)
+    file_path = Path(f"{out_root}/{entry}")
     
     if verbose:
         log_msg = f"[write] {file_path}"
@@ -287,14 +421,22 @@ def process_file_entry(
     if not dry_run:
         if no_overwrite and file_path.exists():
             warnings.append(f"ℹ️ Skipped writing {file_path} due to --no-overwrite")
-        elif cache and not should_update(file_path, content_with_heading, cache, cache_manager):
-            warnings.append(f"ℹ️ Skipped unchanged file {file_path}")
         else:
-            written = safe_write_text(file_path, content_with_heading, warnings, no_overwrite=no_overwrite)
-            if written:
-                files_written = 1
-                if cache:
-                    update_cache(file_path, content_with_heading, cache, cache_manager)
+            # Encode once; the freshness check and any cache update both
+            # reuse these bytes instead of re-encoding per step
+            content_bytes = content_with_heading.encode("utf-8")
+            if cache and not should_update(file_path, content_with_heading, cache,
+                                           cache_manager, content_bytes):
+                warnings.append(f"ℹ️ Skipped unchanged file {file_path}")
+            elif pending_writes is not None:
+                pending_writes.append((file_path, content_with_heading))
+            else:
+                written = safe_write_text(file_path, content_with_heading, warnings, no_overwrite=no_overwrite)
+                if written:
+                    files_written = 1
+                    if cache:
+                        update_cache(file_path, content_with_heading, cache,
+                                     cache_manager, content_bytes)
     
     return str(file_path), lines_written, int(is_placeholder), files_written
 
@@ -302,17 +444,21 @@ def process_directory_entry(
     entry: str,
     out_root: Path,
     dry_run: bool,
-    warnings: List[str]
+    warnings: List[str],
+    pending_dirs: Optional[List[Path]] = None
 ) -> Optional[str]:
     """
     Process a single directory entry for creation.
-    
+
     Args:
         entry: Directory entry path
         out_root: Root output directory
         dry_run: Whether to simulate creation
         warnings: Warnings list to append to
-        
+        pending_dirs: When given, validated paths are queued here instead
+            of created, so the caller can flush only the leaf-most
+            directories (mkdir(parents=True) covers the ancestors)
+
     Returns:
         Directory path if created, None otherwise
     """
@@ -320,19 +466,39 @@ def process_directory_entry(
     if err:
         warnings.append(f"❌ Unsafe path '{entry}': {err}")
         return None
-    
-    parts = entry.split("/")
-    dir_path = out_root.joinpath(*parts)
-    
+
+    dir_path = Path(f"{out_root}/{entry}")
+
     if not dry_run:
+        if pending_dirs is not None:
+            pending_dirs.append(dir_path)
+        else:
+            try:
+                dir_path.mkdir(parents=True, exist_ok=True)
+                logging.debug(f"📁 Created directory: {dir_path}")
+            except Exception as e:
+                warnings.append(f"⚠️ Failed to create directory {dir_path}: {e}")
+                return None
+
+    return str(dir_path)
+
+def _flush_pending_dirs(pending_dirs: List[Path], warnings: List[str]) -> None:
+    """
+    Create queued directories with one mkdir per leaf. After a
+    lexicographic sort, a path is a leaf exactly when the next entry does
+    not extend it, and mkdir(parents=True) on the leaves creates every
+    ancestor implicitly — shallow shared prefixes stop costing their own
+    stat/mkdir walk per entry.
+    """
+    unique = sorted({str(dir_path) for dir_path in pending_dirs})
+    for i, dir_str in enumerate(unique):
+        if i + 1 < len(unique) and unique[i + 1].startswith(dir_str + os.sep):
+            continue
         try:
-            dir_path.mkdir(parents=True, exist_ok=True)
-            logging.debug(f"📁 Created directory: {dir_path}")
+            Path(dir_str).mkdir(parents=True, exist_ok=True)
+            logging.debug(f"📁 Created directory: {dir_str}")
         except Exception as e:
-            warnings.append(f"⚠️ Failed to create directory {dir_path}: {e}")
-            return None
-    
-    return str(dir_path)
+            warnings.append(f"⚠️ Failed to create directory {dir_str}: {e}")
 
 def reconcile_and_write(
     tree_entries: List[str],
@@ -404,7 +570,28 @@ def reconcile_and_write(
         return created_dirs, created_files, warnings, total_lines_written, placeholders_created, files_written_count
     
     logging.info(f"🔨 Reconciling {len(tree_entries)} entries to {out_root} (dry_run: {dry_run})")
-    
+
+    # Each entry writes to a distinct path and safe_write_text creates its
+    # own parent directories, so actual disk writes are deferred here and
+    # flushed through a thread pool after the loop — the open/write/replace
+    # syscalls release the GIL and dominate wall time on large trees
+    # Resolve the partitioned ignore spec once before the loop; suffix
+    # and literal patterns then cost one set probe per entry and only
+    # residual globs hit the merged regex
+    ignore_spec = _compile_ignore_spec(tuple(ignore_patterns)) if ignore_patterns else None
+
+    pending_writes: Optional[List[Tuple[Path, str]]] = [] if not dry_run else None
+    # Directory creation is deferred the same way so redundant
+    # mkdir(parents=True) walks over shared prefixes collapse to one
+    # syscall chain per leaf directory
+    pending_dirs: Optional[List[Path]] = [] if not dry_run else None
+
+    # Basenames repeat across entries; memoize the heuristic per name with
+    # the always-sets pinned in the closure
+    _is_file = lru_cache(maxsize=1024)(
+        lambda name: is_probably_file(name, files_always, dirs_always)
+    )
+
     for entry in tree_entries:
         try:
             entry_clean = normalize_path_segment(entry)
@@ -412,18 +599,19 @@ def reconcile_and_write(
                 warnings.append(f"⚠️ Empty or invalid entry: {entry}")
                 continue
             
-            if should_ignore_entry(entry_clean, ignore_patterns):
+            if ignore_spec is not None and _matches_ignore_spec(entry_clean, ignore_spec):
                 if verbose:
                     logging.debug(f"⏭️ Ignored: {entry_clean}")
                 continue
             
-            name = Path(entry_clean).name
-            if is_probably_file(name, files_always, dirs_always):
+            name = entry_clean.rsplit('/', 1)[-1]
+            if _is_file(name):
                 file_path, lines, placeholder_flag, written_flag = process_file_entry(
                     entry_clean, out_root, code_map, heading_map,
                     dry_run, verbose, skip_empty, no_overwrite,
                     files_always, dirs_always, warnings, cache,
-                    cache_manager  # Pass cache_manager
+                    cache_manager,  # Pass cache_manager
+                    pending_writes
                 )
                 
                 if file_path:
@@ -433,7 +621,7 @@ def reconcile_and_write(
                     files_written_count += written_flag
             else:
                 dir_path = process_directory_entry(
-                    entry_clean, out_root, dry_run, warnings
+                    entry_clean, out_root, dry_run, warnings, pending_dirs
                 )
                 
                 if dir_path:
@@ -442,7 +630,31 @@ def reconcile_and_write(
         except Exception as e:
             warnings.append(f"❌ Error processing entry '{entry}': {e}")
             continue
-    
+
+    # Directories first so file writes land in already-created paths
+    # (safe_write_text would create parents itself, but that costs the
+    # same redundant walks this batch avoids)
+    if pending_dirs:
+        _flush_pending_dirs(pending_dirs, warnings)
+
+    # Flush deferred writes; cache bookkeeping stays on this thread
+    if pending_writes:
+        if len(pending_writes) > 1:
+            max_workers = min(32, (os.cpu_count() or 1) * 4)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(
+                    lambda pw: safe_write_text(pw[0], pw[1], warnings, no_overwrite=no_overwrite),
+                    pending_writes
+                ))
+        else:
+            results = [safe_write_text(p, c, warnings, no_overwrite=no_overwrite)
+                       for p, c in pending_writes]
+        for (file_path, content), written in zip(pending_writes, results):
+            if written:
+                files_written_count += 1
+                if cache:
+                    update_cache(file_path, content, cache, cache_manager)
+
     logging.info(
         f"✅ Reconciliation complete: "
         f"{len(created_dirs)} dirs, {len(created_files)} files, "
@@ -482,7 +694,7 @@ def debug_reconciliation(
     }
     
     for entry in tree_entries:
-        name = Path(entry).name
+        name = entry.rsplit('/', 1)[-1]
         if is_probably_file(name, files_always or set(), dirs_always or set()):
             debug_info["files_in_tree"] += 1
             if entry in code_map and code_map[entry]:
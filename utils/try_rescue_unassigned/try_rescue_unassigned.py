@@ -7,6 +7,10 @@ import logging
 from utils.resolve_conflict_interactive.resolve_conflict_interactive import resolve_conflict_interactive
 from utils.config.config import get_comment_prefix, get_comment_suffix
 
+# Compiled once at import; the per-call re.match(raw_pattern, ...) form paid
+# a cache lookup in the re module for every scanned line
+_HINT_COMMENT_RE = re.compile(r"^(\s*//\s*|\s*#\s*|\s*<!--\s*|\s*/\*\s*)(.*?)(\s*-->|\s*\*/)?$")
+
 def extract_hint_from_code(code: str, max_lines: int = 2) -> Tuple[Optional[str], int]:
     """
     Extract hint from code block comments in first few lines.
@@ -28,7 +32,7 @@ def extract_hint_from_code(code: str, max_lines: int = 2) -> Tuple[Optional[str]
         line = lines[line_num].strip()
         
         # Match various comment styles
-        match = re.match(r"^(\s*//\s*|\s*#\s*|\s*<!--\s*|\s*/\*\s*)(.*?)(\s*-->|\s*\*/)?$", line)
+        match = _HINT_COMMENT_RE.match(line)
         if match:
             hint = match.group(2).strip().lstrip("./").replace('\\', '/')
             if hint:  # Only return non-empty hints
@@ -36,29 +40,58 @@ def extract_hint_from_code(code: str, max_lines: int = 2) -> Tuple[Optional[str]
     
     return None, -1
 
+def build_suffix_index(code_map: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    Index every segment-boundary suffix of each file path ("utils/foo/bar.py"
+    -> "bar.py", "foo/bar.py", ...) so path-like hints resolve with one hash
+    probe instead of an O(files) endswith scan per unassigned block.
+
+    Args:
+        code_map: Mapping of files to code blocks
+
+    Returns:
+        Dict mapping each suffix to the file paths that end with it
+    """
+    index: Dict[str, List[str]] = {}
+    for path in code_map:
+        index.setdefault(path, []).append(path)
+        idx = path.find('/')
+        while idx != -1:
+            index.setdefault(path[idx + 1:], []).append(path)
+            idx = path.find('/', idx + 1)
+    return index
+
 def find_matching_files(
-    hint: str, 
-    code_map: Dict[str, List[str]], 
-    fallback_level: str
+    hint: str,
+    code_map: Dict[str, List[str]],
+    fallback_level: str,
+    suffix_index: Optional[Dict[str, List[str]]] = None
 ) -> List[str]:
     """
     Find files that match a hint using multiple strategies.
-    
+
     Args:
         hint: Hint to match against files
         code_map: Mapping of files to code blocks
         fallback_level: Matching strictness level
-        
+        suffix_index: Optional precomputed output of build_suffix_index
+
     Returns:
         List of matching file paths
     """
     candidates = []
-    
+
     # Strategy 1: Exact path match
     if hint in code_map:
         return [hint]
-    
-    # Strategy 2: Suffix match (file ends with hint)
+
+    # Strategy 2: Suffix match (file ends with hint); the indexed probe
+    # resolves segment-aligned hints in O(1) and only falls back to the
+    # linear scan for tail fragments that cross a path segment
+    if suffix_index is not None:
+        candidates = suffix_index.get(hint, [])
+        if candidates:
+            return list(candidates)
     candidates = [f for f in code_map.keys() if f.endswith(hint)]
     if candidates:
         return candidates
@@ -281,7 +314,11 @@ def try_rescue_unassigned(
     
     rescued_warnings: List[str] = []
     still_unassigned: List[str] = []
-    
+
+    # Keys never change during rescue (only the per-file lists grow), so the
+    # suffix index is built once for all blocks
+    suffix_index = build_suffix_index(code_map)
+
     logging.info(f"🔍 Attempting to rescue {len(unassigned)} unassigned blocks (fallback: {fallback_level})")
     
     for code in unassigned:
@@ -295,7 +332,7 @@ def try_rescue_unassigned(
             
             if hint:
                 # Step 2: Find matching files for the hint
-                candidates = find_matching_files(hint, code_map, fallback_level)
+                candidates = find_matching_files(hint, code_map, fallback_level, suffix_index)
                 
                 if len(candidates) == 1:
                     # Single match - assign directly
@@ -332,7 +369,7 @@ def try_rescue_unassigned(
                 lines = code.splitlines()
                 if lines:
                     assumed_hint = lines[0].strip().lstrip("./").replace('\\', '/')
-                    candidates = find_matching_files(assumed_hint, code_map, fallback_level)
+                    candidates = find_matching_files(assumed_hint, code_map, fallback_level, suffix_index)
                     
                     if len(candidates) == 1:
                         body = "\n".join(lines[1:]).rstrip() if strip_hints else code